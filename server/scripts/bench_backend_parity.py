@@ -0,0 +1,140 @@
+"""
+Benchmark: the same endpoint suite on SQLite (WAL) and Postgres.
+
+Each backend runs in its own subprocess because the engine is built from
+DATABASE_URL at import time. The worker creates and seeds the schema with
+init_db, then issues sequential requests through the app in-process (httpx
+ASGI transport). The admin principal is seeded into the principal cache and
+the public page cache is cleared before every request, so each probe
+measures the endpoint's own queries.
+
+Run this script from the server directory (SQLite needs aiosqlite):
+    uv run python -m scripts.bench_backend_parity
+    uv run python -m scripts.bench_backend_parity --sqlite-url sqlite:///./bench.db --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_ADMIN_PK = -1
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def worker(requests: int) -> dict:
+    """Seed the configured database and time each endpoint"""
+    import httpx
+    import structlog
+
+    from src.core import security
+    from src.core.config import settings
+    from src.db.init_db import init_db
+    from src.db.session import engine
+    from src.main import app
+    from src.api.v1.deps import Principal, principal_cache
+    from src.api.v1.endpoints.site_content import invalidate_cache
+
+    # Keep request logging out of the measurements
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    await init_db()
+    principal_cache.set(BENCH_ADMIN_PK, Principal(
+        id=BENCH_ADMIN_PK,
+        admin_id=None,
+        username="bench",
+        full_name=None,
+        profile_image=None,
+        role="PRINCIPAL",
+        permissions=[],
+        is_active=True,
+    ))
+    headers = {"Authorization": f"Bearer {security.create_access_token(BENCH_ADMIN_PK)}"}
+    api = settings.API_V1_STR
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        students = (await client.get(f"{api}/students/")).json()
+        suite = [
+            f"{api}/students/",
+            f"{api}/students/stats/summary",
+            f"{api}/teachers/",
+            f"{api}/classes/",
+            f"{api}/site-content/public/home",
+        ]
+        if students:
+            suite.insert(1, f"{api}/students/{students[0]['id']}")
+
+        for url in suite:
+            latencies = []
+            for _ in range(requests):
+                invalidate_cache()
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, (url, response.status_code)
+            results[url.replace(api, "")] = {
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+            }
+
+    await engine.dispose()
+    return {"dialect": engine.dialect.name, "endpoints": results}
+
+
+def run_backend(url: str, requests: int) -> dict:
+    env = {**os.environ, "DATABASE_URL": url}
+    env.pop("READ_DATABASE_URL", None)
+    completed = subprocess.run(
+        [sys.executable, "-m", "scripts.bench_backend_parity", "--worker", "--requests", str(requests)],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Run with proper Windows event loop handling."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sqlite-url", default="sqlite:///./bench_parity.db")
+    parser.add_argument("--postgres-url", default=None, help="Defaults to DATABASE_URL from settings")
+    parser.add_argument("--requests", type=int, default=100, help="Sequential requests per endpoint")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        # Use WindowsSelectorEventLoopPolicy to avoid SSL cleanup issues
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    if args.worker:
+        print(json.dumps(asyncio.run(worker(args.requests))))
+        return
+
+    if args.postgres_url is None:
+        from src.core.config import settings
+        args.postgres_url = settings.DATABASE_URL
+
+    runs = [run_backend(url, args.requests) for url in (args.sqlite_url, args.postgres_url)]
+    print(f"{args.requests} sequential requests per endpoint")
+    print(f"{'endpoint':<32}" + "".join(f"{run['dialect'] + ' p50/p99 (ms)':>28}" for run in runs))
+    for endpoint in runs[0]["endpoints"]:
+        cells = []
+        for run in runs:
+            timing = run["endpoints"].get(endpoint)
+            cells.append(f"{timing['p50_ms']:>12.2f} / {timing['p99_ms']:<10.2f}" if timing else f"{'-':>28}")
+        print(f"{endpoint:<32}" + "".join(f"{cell:>28}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
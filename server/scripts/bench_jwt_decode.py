@@ -0,0 +1,97 @@
+"""
+Microbenchmark: JWT verification cost with and without the verified-token cache.
+
+Compares a plain python-jose `jwt.decode` against `security.decode_access_token`
+(digest-keyed memo cache) for the HS256 default and for RS256, where signature
+verification is far more expensive.
+
+Run this script from the server directory:
+    uv run python -m scripts.bench_jwt_decode
+    uv run python -m scripts.bench_jwt_decode --iterations 20000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from src.core import security
+from src.core.config import settings
+
+
+def make_rsa_keys() -> tuple[str, str]:
+    """Generate a throwaway RSA key pair as PEM strings"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+def time_per_call_us(func, token: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(token)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def bench_algorithm(algorithm: str, signing_key: str, verify_key: str, iterations: int) -> dict:
+    # Point the app's settings at this algorithm so the real code path is measured
+    settings.ALGORITHM = algorithm
+    settings.SECRET_KEY = verify_key
+    security.token_cache.clear()
+    security.token_cache.hits = security.token_cache.misses = 0
+
+    claims = {
+        "sub": "1",
+        "exp": datetime.utcnow() + timedelta(minutes=30),
+        "admin_id": "ADM-001",
+        "role": "PRINCIPAL",
+    }
+    token = jwt.encode(claims, signing_key, algorithm=algorithm)
+
+    uncached = time_per_call_us(
+        lambda t: jwt.decode(t, verify_key, algorithms=[algorithm]), token, iterations
+    )
+    cached = time_per_call_us(security.decode_access_token, token, iterations)
+    return {
+        "algorithm": algorithm,
+        "uncached_us": uncached,
+        "cached_us": cached,
+        "speedup": uncached / cached if cached else float("inf"),
+        "cache": security.token_cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JWT decode with and without the cache")
+    parser.add_argument("--iterations", type=int, default=5000, help="Decodes per measurement")
+    args = parser.parse_args()
+
+    private_pem, public_pem = make_rsa_keys()
+    cases = [
+        ("HS256", settings.SECRET_KEY, settings.SECRET_KEY),
+        ("RS256", private_pem, public_pem),
+    ]
+
+    print(f"{args.iterations} decodes per case, cache size {settings.JWT_CACHE_SIZE}")
+    for algorithm, signing_key, verify_key in cases:
+        result = bench_algorithm(algorithm, signing_key, verify_key, args.iterations)
+        print(
+            f"{result['algorithm']}: jwt.decode {result['uncached_us']:8.1f} us/op  "
+            f"cached {result['cached_us']:6.1f} us/op  ({result['speedup']:.0f}x)  "
+            f"hits={result['cache']['hits']} misses={result['cache']['misses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: p99 latency of the public site content endpoint during a login storm.
+
+Runs the app in-process (httpx ASGI transport) with the `home` page cached,
+so the probe requests never touch the database. The storm runs argon2
+verifications either inline on the event loop (what the handlers used to do)
+or through the bounded password worker pool.
+
+Run this script from the server directory:
+    uv run python -m scripts.bench_login_storm
+    uv run python -m scripts.bench_login_storm --storm 16 --seconds 10
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+import httpx
+import structlog
+
+from src.core import security
+from src.core.config import settings
+from src.main import app
+from src.api.v1.endpoints.site_content import set_cached_page
+
+
+async def login_storm(mode: str, hashed: str, stop: asyncio.Event, counters: dict):
+    """Keep one simulated login in progress until told to stop"""
+    while not stop.is_set():
+        try:
+            if mode == "inline":
+                security.verify_password("wrong-password", hashed)
+                await asyncio.sleep(0)
+            else:
+                await security.verify_password_async("wrong-password", hashed)
+            counters["logins"] += 1
+        except security.PasswordHashingBusy:
+            counters["rejected"] += 1
+            await asyncio.sleep(0.005)
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    """Sequentially request the public page and record latencies (ms)"""
+    url = f"{settings.API_V1_STR}/site-content/public/home"
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_case(mode: str, storm_size: int, seconds: float, hashed: str) -> dict:
+    stop = asyncio.Event()
+    counters = {"logins": 0, "rejected": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        storm = [
+            asyncio.create_task(login_storm(mode, hashed, stop, counters))
+            for _ in range(storm_size if mode != "idle" else 0)
+        ]
+        probe_task = asyncio.create_task(probe(client, stop))
+        await asyncio.sleep(seconds)
+        stop.set()
+        latencies = await probe_task
+        await asyncio.gather(*storm)
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+        "logins": counters["logins"],
+        "rejected": counters["rejected"],
+    }
+
+
+async def main_async(args):
+    # Keep request logging out of the measurements
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    set_cached_page("home", [])
+    hashed = security.get_password_hash("correct-password")
+
+    print(f"Storm size: {args.storm}, duration: {args.seconds}s per case, "
+          f"workers: {settings.PASSWORD_HASH_WORKERS}, queue limit: {settings.PASSWORD_HASH_QUEUE_LIMIT}")
+    for mode in ("idle", "inline", "pool"):
+        result = await run_case(mode, args.storm, args.seconds, hashed)
+        print(
+            f"{result['mode']:>7}: {result['requests']:5d} probes  "
+            f"p50={result['p50_ms']:8.2f}ms  p99={result['p99_ms']:8.2f}ms  max={result['max_ms']:8.2f}ms  "
+            f"logins={result['logins']}  rejected={result['rejected']}"
+        )
+
+
+def main():
+    """Run with proper Windows event loop handling."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--storm", type=int, default=8, help="Concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each case")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        # Use WindowsSelectorEventLoopPolicy to avoid SSL cleanup issues
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
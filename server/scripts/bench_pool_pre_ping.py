@@ -0,0 +1,133 @@
+"""
+Benchmark: per-request latency of GET /students/ with and without pool pre-ping.
+
+Runs the app in-process (httpx ASGI transport) against DATABASE_URL and adds
+a simulated network round trip (default 50 ms) to every statement and every
+pre-ping, the way a cross-region database behaves. The admin principal is
+seeded into the principal cache, so each probe runs only the list query
+(plus the pre-ping when it is enabled).
+
+Run this script from the server directory:
+    uv run python -m scripts.bench_pool_pre_ping
+    uv run python -m scripts.bench_pool_pre_ping --delay-ms 50 --requests 100
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+import httpx
+import structlog
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+
+from src.core import security
+from src.core.config import settings
+from src.db.session import engine
+from src.main import app
+from src.api.v1.deps import Principal, principal_cache
+
+BENCH_ADMIN_PK = -1
+
+
+def simulate_network_delay(delay_s: float):
+    """Add one round trip to every statement and every pre-ping on the engine"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _delay_statement(conn, cursor, statement, parameters, context, executemany):
+        # Listeners run inside SQLAlchemy's greenlet, so awaiting is allowed
+        await_only(asyncio.sleep(delay_s))
+
+    dialect = sync_engine.dialect
+    do_ping = dialect.do_ping
+
+    def _delayed_ping(dbapi_connection):
+        await_only(asyncio.sleep(delay_s))
+        return do_ping(dbapi_connection)
+
+    dialect.do_ping = _delayed_ping
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_case(pre_ping: bool, requests: int, token: str) -> dict:
+    # The pool reads this flag on every checkout
+    engine.pool._pre_ping = pre_ping
+    url = f"{settings.API_V1_STR}/students/"
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm the pool so connect time is not measured
+        await client.get(url, headers=headers)
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.status_code
+
+    return {
+        "mode": "pre_ping" if pre_ping else "health",
+        "requests": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+    }
+
+
+async def main_async(args):
+    # Keep request logging out of the measurements
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    simulate_network_delay(args.delay_ms / 1000)
+    principal_cache.set(BENCH_ADMIN_PK, Principal(
+        id=BENCH_ADMIN_PK,
+        admin_id=None,
+        username="bench",
+        full_name=None,
+        profile_image=None,
+        role="PRINCIPAL",
+        permissions=[],
+        is_active=True,
+    ))
+    token = security.create_access_token(BENCH_ADMIN_PK)
+
+    print(f"Simulated round trip: {args.delay_ms}ms, {args.requests} sequential requests per case")
+    results = []
+    for pre_ping in (True, False):
+        result = await run_case(pre_ping, args.requests, token)
+        results.append(result)
+        print(
+            f"{result['mode']:>9}: p50={result['p50_ms']:8.2f}ms  "
+            f"p99={result['p99_ms']:8.2f}ms  mean={result['mean_ms']:8.2f}ms"
+        )
+    saved = results[0]["mean_ms"] - results[1]["mean_ms"]
+    print(f"Saved per request: {saved:.2f}ms")
+    await engine.dispose()
+
+
+def main():
+    """Run with proper Windows event loop handling."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--delay-ms", type=float, default=50.0, help="Simulated network round trip")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per case")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        # Use WindowsSelectorEventLoopPolicy to avoid SSL cleanup issues
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Calibrate argon2 cost parameters for this host.
+
+Benchmarks argon2id verification and picks the largest memory cost (and then
+the largest time cost) that keeps a single verify under the target latency.
+With --write the result is stored in .env, which Settings reads on startup;
+existing password hashes are upgraded on each admin's next login.
+
+Run this script from the server directory (on the target instance):
+    uv run python -m scripts.calibrate_argon2
+    uv run python -m scripts.calibrate_argon2 --target-ms 75 --write
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from passlib.hash import argon2
+
+# OWASP minimum is 19 MiB with time_cost=2; never go below it
+MEMORY_CANDIDATES_KIB = [262144, 131072, 65536, 47104, 32768, 19456]
+MIN_TIME_COST = 2
+MAX_TIME_COST = 10
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    """Median latency (ms) of one verify with the given costs"""
+    hasher = argon2.using(rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = hasher.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, parallelism: int, max_memory_kib: int, samples: int) -> dict:
+    """Pick the strongest (memory_cost, time_cost) pair under target_ms"""
+    candidates = [m for m in MEMORY_CANDIDATES_KIB if m <= max_memory_kib] or [MEMORY_CANDIDATES_KIB[-1]]
+
+    for memory_cost in candidates:
+        elapsed = measure_verify_ms(MIN_TIME_COST, memory_cost, parallelism, samples)
+        print(f"  m={memory_cost // 1024:4d} MiB t={MIN_TIME_COST:2d} -> {elapsed:7.1f} ms")
+        if elapsed > target_ms:
+            continue
+
+        # Memory fits; spend the remaining budget on extra passes
+        time_cost = MIN_TIME_COST
+        while time_cost < MAX_TIME_COST:
+            next_elapsed = measure_verify_ms(time_cost + 1, memory_cost, parallelism, samples)
+            print(f"  m={memory_cost // 1024:4d} MiB t={time_cost + 1:2d} -> {next_elapsed:7.1f} ms")
+            if next_elapsed > target_ms:
+                break
+            time_cost += 1
+            elapsed = next_elapsed
+        return {"time_cost": time_cost, "memory_cost": memory_cost, "parallelism": parallelism, "ms": elapsed}
+
+    # Nothing fits the budget; fall back to the minimum recommended costs
+    memory_cost = candidates[-1]
+    elapsed = measure_verify_ms(MIN_TIME_COST, memory_cost, parallelism, samples)
+    return {"time_cost": MIN_TIME_COST, "memory_cost": memory_cost, "parallelism": parallelism, "ms": elapsed}
+
+
+def write_env(env_path: Path, values: dict):
+    """Update (or append) ARGON2_* keys in the .env file"""
+    lines = env_path.read_text().splitlines() if env_path.exists() else []
+    remaining = dict(values)
+    updated = []
+    for line in lines:
+        key = line.split("=", 1)[0].strip()
+        if key in remaining:
+            updated.append(f"{key}={remaining.pop(key)}")
+        else:
+            updated.append(line)
+    if remaining:
+        if updated:
+            updated.append("")
+        updated.append("# Argon2 costs (scripts/calibrate_argon2.py)")
+        updated.extend(f"{key}={value}" for key, value in remaining.items())
+    env_path.write_text("\n".join(updated) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate argon2 costs for this host")
+    parser.add_argument("--target-ms", type=float, default=50.0, help="Target verify latency in ms")
+    parser.add_argument("--parallelism", type=int, default=1, help="argon2 lanes (match available cores)")
+    parser.add_argument("--max-memory-mb", type=int, default=64, help="Upper bound on memory per hash")
+    parser.add_argument("--samples", type=int, default=5, help="Verifications per measurement")
+    parser.add_argument("--write", action="store_true", help="Write the result to .env")
+    parser.add_argument("--env-file", default=".env", help="Path of the env file to update")
+    args = parser.parse_args()
+
+    print(f"Calibrating argon2id for a {args.target_ms:.0f} ms verify target...")
+    result = calibrate(args.target_ms, args.parallelism, args.max_memory_mb * 1024, args.samples)
+
+    values = {
+        "ARGON2_TIME_COST": result["time_cost"],
+        "ARGON2_MEMORY_COST": result["memory_cost"],
+        "ARGON2_PARALLELISM": result["parallelism"],
+    }
+    print(f"\nSelected: time_cost={result['time_cost']} memory_cost={result['memory_cost']} KiB "
+          f"parallelism={result['parallelism']} (~{result['ms']:.1f} ms per verify)")
+
+    if args.write:
+        write_env(Path(args.env_file), values)
+        print(f"Written to {args.env_file}; restart the server to apply.")
+    else:
+        print("\n".join(f"{key}={value}" for key, value in values.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Apply versioned schema migrations (src/db/migrations) to DATABASE_URL.
+
+Run this script from the server directory:
+    uv run python -m scripts.migrate            # apply everything pending
+    uv run python -m scripts.migrate --status   # show current/latest version
+    uv run python -m scripts.migrate --target 2
+"""
+
+import argparse
+import asyncio
+import sys
+
+from src.db.migrations import LATEST_VERSION, MIGRATIONS, current_version, run_migrations
+from src.db.session import engine
+
+
+async def main_async(args):
+    version = await current_version(engine)
+    print(f"Schema version: {version} (latest: {LATEST_VERSION})")
+    if args.status:
+        for migration in MIGRATIONS:
+            state = "applied" if migration.VERSION <= version else "pending"
+            print(f"  {migration.VERSION:04d} {state:>8}  {migration.DESCRIPTION}")
+    else:
+        applied = await run_migrations(engine, target=args.target)
+        print(f"Applied: {applied or 'nothing to do'}")
+    await engine.dispose()
+
+
+def main():
+    """Run with proper Windows event loop handling."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--status", action="store_true", help="Only report versions")
+    parser.add_argument("--target", type=int, default=None, help="Stop after this version")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        # Use WindowsSelectorEventLoopPolicy to avoid SSL cleanup issues
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
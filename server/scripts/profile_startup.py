@@ -0,0 +1,105 @@
+"""
+Profile: import time of the app and time-to-first-byte after a cold start.
+
+Imports src.main in a fresh interpreter with `python -X importtime` and lists
+the slowest modules by cumulative time. With --ttfb it also starts uvicorn in
+a subprocess and measures from spawn to the first byte of GET /, which is
+what a request waking the free-tier instance waits for.
+
+--budget-ms turns the import profile into a startup budget check: the script
+exits with status 1 when importing src.main takes longer than the budget.
+tests/test_startup.py runs the same check as part of the test suite.
+
+Run this script from the server directory:
+    uv run python -m scripts.profile_startup
+    uv run python -m scripts.profile_startup --top 30 --budget-ms 1500 --ttfb
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+APP_MODULE = "src.main"
+
+
+def profile_imports() -> list:
+    """(module, self_ms, cumulative_ms) for every module imported by src.main"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_ttfb(timeout: float) -> float:
+    """Spawn uvicorn and return milliseconds until the first byte of GET /"""
+    port = free_port()
+    request = f"GET / HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n\r\n".encode()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{APP_MODULE}:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+                    sock.sendall(request)
+                    if sock.recv(1):
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when importing src.main exceeds this")
+    parser.add_argument("--ttfb", action="store_true", help="Also measure spawn-to-first-byte with uvicorn")
+    parser.add_argument("--timeout", type=float, default=60.0, help="TTFB wait limit in seconds")
+    args = parser.parse_args()
+
+    modules = profile_imports()
+    total_ms = next(cumulative for name, _, cumulative in modules if name == APP_MODULE)
+
+    print(f"{'module':<60}{'self (ms)':>12}{'cumulative (ms)':>18}")
+    for name, self_ms, cumulative_ms in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{name:<60}{self_ms:>12.1f}{cumulative_ms:>18.1f}")
+    print(f"\nimport {APP_MODULE}: {total_ms:.1f}ms ({len(modules)} modules)")
+
+    if args.ttfb:
+        print(f"Spawn to first byte: {measure_ttfb(args.timeout):.1f}ms")
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"FAIL: import exceeds the {args.budget_ms:.0f}ms budget by {total_ms - args.budget_ms:.1f}ms")
+            sys.exit(1)
+        print(f"OK: within the {args.budget_ms:.0f}ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,206 @@
 """
 Admin Authentication Dependencies
 """
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import lambda_stmt
 from sqlalchemy.future import select
-from jose import jwt, JWTError
+from jose import JWTError
 
 from src.db.session import get_db
-from src.db.models.admin import Admin
+from src.db.models.admin import Admin, PERMISSION_BITS, admin_permission_mask
 from src.core.config import settings
+from src.core.cache import TTLCache
+from src.core.security import decode_access_token
+from src.core.token_versions import token_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token")
 
-async def get_current_admin(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> Admin:
+
+@dataclass(frozen=True)
+class Principal:
     """
-    Dependency to get current authenticated admin user from JWT token.
-    Use this to protect admin-only endpoints.
+    Snapshot of the authenticated admin used for authorization.
+    Never carries the password hash; handlers that need the full row load it.
     """
-    credentials_exception = HTTPException(
+    id: int
+    admin_id: Optional[str]
+    username: str
+    full_name: Optional[str]
+    profile_image: Optional[str]
+    role: str
+    permissions: List[str]
+    is_active: bool
+    permission_mask: int = 0
+    token_version: int = 0
+
+    def has_permission(self, permission: str) -> bool:
+        """PRINCIPAL has every permission; others by bit, or by name outside the bit index"""
+        if self.role == "PRINCIPAL":
+            return True
+        permission_bit = PERMISSION_BITS.get(permission)
+        if permission_bit is not None:
+            return bool(self.permission_mask & permission_bit)
+        return permission in (self.permissions or [])
+
+    @classmethod
+    def from_admin(cls, admin: Admin) -> "Principal":
+        return cls(
+            id=admin.id,
+            admin_id=admin.admin_id,
+            username=admin.username,
+            full_name=admin.full_name,
+            profile_image=admin.profile_image,
+            role=admin.role,
+            permissions=list(admin.permissions or []),
+            is_active=bool(admin.is_active),
+            permission_mask=(
+                admin.permission_mask
+                if admin.permission_mask
+                else admin_permission_mask(admin.role, admin.permissions)
+            ),
+            token_version=admin.token_version or 0,
+        )
+
+
+# ==================== PRINCIPAL CACHE ====================
+# Bounded TTL/LRU cache keyed by admin primary key - saves the admins
+# lookup on every protected request. Writers must call invalidate_principal;
+# that only reaches this worker, so hits are also checked against the shared
+# token version table (see _load_principal).
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(admin_pk: int = None):
+    """Invalidate cached principal for one admin or all admins"""
+    if admin_pk is None:
+        principal_cache.clear()
+    else:
+        principal_cache.pop(admin_pk)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _revoked_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_token(token: str, request: Request) -> dict:
+    """Verify the JWT and return a copy of its claims (raises 401 on any failure)"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    # Fetch admin from database
-    result = await db.execute(select(Admin).filter(Admin.id == int(user_id)))
-    admin = result.scalars().first()
-    
-    if admin is None:
-        raise credentials_exception
+        payload = dict(decode_access_token(token))
+        payload["sub"] = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
+        raise _credentials_exception()
+    # Read-replica routing pins this admin to the primary after their writes
+    request.state.admin_pk = payload["sub"]
+    return payload
+
+
+async def _load_principal(admin_pk: int, db: AsyncSession, token_version: Optional[int] = None) -> Principal:
+    """
+    Resolve an admin principal from the cache, falling back to the database.
+    A cached entry older than the version table's is reloaded. Tokens that
+    carry a version (claims mode) must match the admin's current one.
+    """
+    principal = principal_cache.get(admin_pk)
+    if principal is not None and token_versions.is_newer(admin_pk, principal.token_version):
+        # Changed or deleted through another worker since it was cached
+        principal_cache.pop(admin_pk)
+        principal = None
+    if principal is None:
+        # Cache miss - fetch admin from database
+        # Lambda statement: cache key and compiled SQL are reused across calls
+        result = await db.execute(lambda_stmt(lambda: select(Admin).filter(Admin.id == admin_pk)))
+        admin = result.scalars().first()
+        
+        if admin is None:
+            raise _credentials_exception()
+        
+        principal = Principal.from_admin(admin)
+        principal_cache.set(admin_pk, principal)
     
-    if not admin.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive admin account"
         )
+    if token_version is not None and token_version != principal.token_version:
+        raise _revoked_exception()
+    
+    return principal
+
+
+def _principal_from_claims(payload: dict) -> Optional[Principal]:
+    """
+    Build a principal from token claims alone (claims mode).
+    Returns None when the version table cannot vouch for the token.
+    """
+    version = payload.get("ver")
+    if version is None or "role" not in payload:
+        return None
+    
+    state = token_versions.check(payload["sub"], version)
+    if state is None:
+        return None
+    if state is False:
+        raise _revoked_exception()
     
-    return admin
+    permissions = list(payload.get("permissions") or [])
+    return Principal(
+        id=payload["sub"],
+        admin_id=payload.get("admin_id"),
+        username=payload.get("username", ""),
+        full_name=None,
+        profile_image=None,
+        role=payload["role"],
+        permissions=permissions,
+        is_active=True,
+        permission_mask=admin_permission_mask(payload["role"], permissions),
+    )
+
+
+async def get_current_admin(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Dependency to get current authenticated admin user from JWT token.
+    Use this to protect admin-only endpoints.
+    
+    Versioned tokens are checked against the version table like in
+    require_permission, so a revoked token is refused on every route.
+    
+    Performance: O(1) principal cache hit, one indexed lookup on miss.
+    """
+    payload = _decode_token(token, request)
+    version = payload.get("ver")
+    if version is not None and token_versions.check(payload["sub"], version) is False:
+        raise _revoked_exception()
+    return await _load_principal(payload["sub"], db, version)
 
 
 async def get_current_superadmin(
-    current_admin: Admin = Depends(get_current_admin)
-) -> Admin:
+    current_admin: Principal = Depends(get_current_admin)
+) -> Principal:
     """
     Dependency to require superadmin role.
     """
@@ -68,19 +215,39 @@ async def get_current_superadmin(
 def require_permission(permission: str):
     """
     Factory function to create permission-checking dependency.
-    Usage: current_admin: Admin = Depends(require_permission("view_students"))
+    Usage: current_admin: Principal = Depends(require_permission("view_students"))
     PRINCIPAL role bypasses all permission checks.
+    
+    In claims mode (AUTH_CLAIMS_MODE) the check runs on the token claims
+    without touching the database while the token version is current.
+    
+    Performance: O(1) bit test for permissions in PERMISSION_BITS; names
+    outside the bit index fall back to a list scan.
     """
+    permission_bit = PERMISSION_BITS.get(permission)
+    
     async def permission_checker(
-        current_admin: Admin = Depends(get_current_admin)
-    ) -> Admin:
+        request: Request,
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_db)
+    ) -> Principal:
+        payload = _decode_token(token, request)
+        current_admin = None
+        if settings.AUTH_CLAIMS_MODE:
+            current_admin = _principal_from_claims(payload)
+        if current_admin is None:
+            current_admin = await _load_principal(payload["sub"], db, payload.get("ver"))
+        
         # PRINCIPAL has all permissions
         if current_admin.role == "PRINCIPAL":
             return current_admin
         
         # Check if admin has the required permission
-        permissions = current_admin.permissions or []
-        if permission not in permissions:
+        if permission_bit is not None:
+            allowed = bool(current_admin.permission_mask & permission_bit)
+        else:
+            allowed = permission in (current_admin.permissions or [])
+        if not allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission denied. Required: {permission}"
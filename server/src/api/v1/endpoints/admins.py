@@ -3,24 +3,26 @@ Admin Management API Endpoints
 Only accessible by PRINCIPAL role
 """
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import or_
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
-from src.db.session import AsyncSessionLocal
-from src.db.models.admin import Admin, AVAILABLE_PERMISSIONS, PRINCIPAL_PERMISSIONS, ROLE_TEMPLATES
-from src.core.security import get_password_hash
+from src.db.session import get_db
+from src.db.models.admin import (
+    Admin, AVAILABLE_PERMISSIONS, PRINCIPAL_PERMISSIONS, ROLE_TEMPLATES,
+    PERMISSION_BITS, ROLE_TEMPLATE_MASKS, admin_permission_mask
+)
+from src.core.security import get_password_hash_async
+from src.db.public_ids import admin_numbers, format_admin_id, insert_numbered
+from src.api.v1.deps import invalidate_principal
+from src.core.token_versions import token_versions
 
 logger = structlog.get_logger()
 router = APIRouter()
 
-# Dependency to get DB session
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
 # Pydantic schemas
 class AdminCreate(BaseModel):
     username: str
@@ -50,23 +52,44 @@ class AdminResponse(BaseModel):
 class PermissionsResponse(BaseModel):
     permissions: List[str]
     templates: Dict[str, Any]
+    bits: Dict[str, int]
 
 
-@router.get("/permissions")
+@router.get("/permissions", response_model=PermissionsResponse)
 async def get_available_permissions():
-    """Get list of available permissions and role templates"""
+    """Get list of available permissions, their bits and role templates with masks"""
     return {
         "permissions": AVAILABLE_PERMISSIONS,
-        "templates": ROLE_TEMPLATES
+        "templates": {
+            key: {**template, "mask": ROLE_TEMPLATE_MASKS[key]}
+            for key, template in ROLE_TEMPLATES.items()
+        },
+        "bits": PERMISSION_BITS
     }
 
 
 @router.get("/", response_model=List[AdminResponse])
 async def list_admins(
+    has_permission: Optional[str] = Query(None, description="Only admins holding this permission"),
     db: AsyncSession = Depends(get_db)
 ):
     """List all admins (Principal only)"""
-    result = await db.execute(select(Admin).order_by(Admin.id))
+    query = select(Admin).order_by(Admin.id)
+    
+    if has_permission:
+        bit = PERMISSION_BITS.get(has_permission)
+        if bit is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown permission: {has_permission}"
+            )
+        # Single bitwise predicate on the stored mask
+        query = query.filter(or_(
+            Admin.role == "PRINCIPAL",
+            Admin.permission_mask.op("&")(bit) != 0
+        ))
+    
+    result = await db.execute(query)
     admins = result.scalars().all()
     return admins
 
@@ -85,12 +108,6 @@ async def create_admin(
             detail="Username already exists"
         )
     
-    # Generate admin_id
-    result = await db.execute(select(Admin).order_by(Admin.id.desc()).limit(1))
-    last_admin = result.scalars().first()
-    next_id = (last_admin.id + 1) if last_admin else 1
-    admin_id = f"ADM-{next_id:03d}"
-    
     # Get permissions from role template or use provided permissions
     role_template = admin_data.role_template
     if role_template in ROLE_TEMPLATES:
@@ -101,21 +118,26 @@ async def create_admin(
     else:
         permissions = admin_data.permissions
     
-    new_admin = Admin(
-        admin_id=admin_id,
+    values = dict(
         username=admin_data.username,
-        hashed_password=get_password_hash(admin_data.password),
+        hashed_password=await get_password_hash_async(admin_data.password),
         full_name=admin_data.full_name,
         role="ADMIN",  # Always ADMIN, Principal creates admins not other principals
         permissions=permissions,
+        permission_mask=admin_permission_mask("ADMIN", permissions),
         is_active=True
     )
     
-    db.add(new_admin)
+    # Generate admin_id from the shared sequence (after hashing, so SQLite's
+    # counter row is not locked meanwhile); on Postgres the INSERT draws it
+    number = await admin_numbers.next(db)
+    result = await db.execute(
+        insert_numbered(Admin, values, number, {"admin_id": format_admin_id}).returning(Admin)
+    )
+    new_admin = result.scalar_one()
     await db.commit()
-    await db.refresh(new_admin)
     
-    logger.info("Admin created", admin_id=admin_id, username=admin_data.username, template=role_template)
+    logger.info("Admin created", admin_id=new_admin.admin_id, username=admin_data.username, template=role_template)
     return new_admin
 
 
@@ -138,18 +160,24 @@ async def update_admin(
     # Update fields
     if admin_data.full_name is not None:
         admin.full_name = admin_data.full_name
-    if admin_data.role is not None:
-        admin.role = admin_data.role
-        # If role changed to PRINCIPAL, give all permissions
-        if admin_data.role == "PRINCIPAL":
-            admin.permissions = PRINCIPAL_PERMISSIONS
-    if admin_data.permissions is not None and admin.role != "PRINCIPAL":
+    # PRINCIPAL always keeps all permissions
+    if admin.role == "PRINCIPAL":
+        admin.permissions = PRINCIPAL_PERMISSIONS
+    elif admin_data.role_template in ROLE_TEMPLATES and admin_data.role_template != "CUSTOM":
+        admin.permissions = ROLE_TEMPLATES[admin_data.role_template]["permissions"]
+    elif admin_data.permissions is not None:
         admin.permissions = admin_data.permissions
+    admin.permission_mask = admin_permission_mask(admin.role, admin.permissions)
     if admin_data.is_active is not None:
         admin.is_active = admin_data.is_active
     
+    # Any change revokes tokens issued with the old role/permissions
+    admin.token_version = (admin.token_version or 0) + 1
+    
     await db.commit()
     await db.refresh(admin)
+    invalidate_principal(admin.id)
+    token_versions.bump(admin.id, admin.token_version, admin.is_active)
     
     logger.info("Admin updated", admin_id=admin.admin_id)
     return admin
@@ -182,6 +210,8 @@ async def delete_admin(
     
     await db.delete(admin)
     await db.commit()
+    invalidate_principal(admin.id)
+    token_versions.revoke(admin.id)
     
     logger.info("Admin deleted", admin_id=admin.admin_id)
     return None
@@ -11,20 +11,14 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date
 
-from src.db.session import AsyncSessionLocal
+from src.db.session import get_db
 from src.db.models.application import Application
-from src.db.models.admin import Admin
-from src.api.v1.deps import get_current_admin
+from src.api.v1.deps import get_current_admin, Principal
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
-
 # Pydantic schemas
 class ApplicationCreate(BaseModel):
     student_name: str
@@ -94,7 +88,7 @@ def application_to_response(app: Application) -> dict:
 async def list_applications(
     status: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """List all applications (Admin only)"""
     query = select(Application).order_by(Application.created_at.desc())
@@ -111,7 +105,7 @@ async def list_applications(
 @router.get("/stats/summary")
 async def get_application_stats(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Get application statistics (Admin only)"""
     result = await db.execute(select(Application))
@@ -134,7 +128,7 @@ async def get_application_stats(
 async def get_application(
     application_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Get a single application by ID (Admin only)"""
     query = select(Application).filter(Application.id == application_id)
@@ -182,7 +176,7 @@ async def update_application(
     application_id: str,
     app_data: ApplicationUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Update an application (Admin only)"""
     result = await db.execute(select(Application).filter(Application.id == application_id))
@@ -209,7 +203,7 @@ async def update_application(
 async def delete_application(
     application_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Delete an application (Admin only)"""
     result = await db.execute(select(Application).filter(Application.id == application_id))
@@ -1,33 +1,138 @@
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from sqlalchemy import update, delete
 
-from src.db.session import get_db
+from src.db.session import get_db, AsyncSessionLocal
 from src.db.models.admin import Admin
+from src.db.models.refresh_token import RefreshToken
 import structlog
 from src.core import security
+from src.core.config import settings
+from src.core.rate_limit import limiter
+from src.core.token_versions import token_versions
 
 logger = structlog.get_logger()
 router = APIRouter()
 
-# Create limiter for this router
-limiter = Limiter(key_func=get_remote_address)
+
+async def rehash_password(admin_pk: int, plain_password: str, old_hash: str):
+    """
+    Background task: re-hash a password with the current argon2 costs.
+    Only replaces the hash if it has not changed since login.
+    """
+    try:
+        new_hash = await security.get_password_hash_async(plain_password)
+    except security.PasswordHashingBusy:
+        # Pool is busy; the next login will try again
+        return
+    
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Admin)
+            .where(Admin.id == admin_pk, Admin.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
+    logger.info("password_rehashed", admin_pk=admin_pk)
+
+
+def create_admin_access_token(admin: Admin) -> str:
+    extra_claims = {"admin_id": admin.admin_id, "role": admin.role}
+    return security.create_access_token(
+        subject=admin.id,
+        extra_claims=extra_claims,
+        permissions=admin.permissions,
+        token_version=admin.token_version or 0
+    )
+
+
+def add_refresh_token(db: AsyncSession, admin_pk: int) -> str:
+    """Stage a new refresh token row (hash only) and return the raw token"""
+    token, token_hash = security.create_refresh_token()
+    db.add(RefreshToken(
+        admin_id=admin_pk,
+        token_hash=token_hash,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    return token
+
+
+REFRESH_COOKIE = "admin_refresh_token"
+# Only sent to POST/DELETE /refresh; JavaScript never sees the token
+REFRESH_COOKIE_PATH = f"{settings.API_V1_STR}/refresh"
+
+
+def set_refresh_cookie(response: Response, token: str):
+    response.set_cookie(
+        REFRESH_COOKIE,
+        token,
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        path=REFRESH_COOKIE_PATH,
+        secure=True,
+        httponly=True,
+        samesite=settings.REFRESH_COOKIE_SAMESITE,
+    )
+
+
+def clear_refresh_cookie(response: Response):
+    response.delete_cookie(
+        REFRESH_COOKIE,
+        path=REFRESH_COOKIE_PATH,
+        secure=True,
+        httponly=True,
+        samesite=settings.REFRESH_COOKIE_SAMESITE,
+    )
+
+
+async def reap_expired_refresh_tokens() -> int:
+    """Delete expired refresh tokens in small batches to keep locks short"""
+    batch_size = settings.REFRESH_TOKEN_REAP_BATCH_SIZE
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            expired_ids = (
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at < datetime.now(timezone.utc))
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired_ids)))
+            await db.commit()
+        total += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return total
+        await asyncio.sleep(0.1)  # Yield between batches
+
+
+async def refresh_token_reaper_loop():
+    """Background task: prune expired refresh tokens periodically"""
+    while True:
+        try:
+            reaped = await reap_expired_refresh_tokens()
+            if reaped:
+                logger.info("refresh_tokens_reaped", count=reaped)
+        except Exception as e:
+            logger.warning(f"Refresh token reaper failed: {e}")
+        await asyncio.sleep(settings.REFRESH_TOKEN_REAP_INTERVAL_SECONDS)
 
 @router.post("/login/access-token", response_model=dict)
 @limiter.limit("5/minute") # Max 5 login attempts per minute per IP
 async def login_access_token(
     request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
+    The refresh token is set as an HttpOnly cookie (see set_refresh_cookie).
     Rate limited to 5 attempts per minute per IP to prevent brute-force.
     """
     client_ip = request.client.host if request.client else "unknown"
@@ -42,7 +147,7 @@ async def login_access_token(
     admin = result.scalars().first()
 
     # 2. Authenticate
-    if not admin or not security.verify_password(form_data.password, admin.hashed_password):
+    if not admin or not await security.verify_password_async(form_data.password, admin.hashed_password):
         logger.warning(
             "login_failed",
             reason="invalid_credentials",
@@ -66,9 +171,14 @@ async def login_access_token(
         )
         raise HTTPException(status_code=400, detail="Inactive user")
 
-    # 3. Create Token
-    extra_claims = {"admin_id": admin.admin_id, "role": admin.role}
-    access_token = security.create_access_token(subject=admin.id, extra_claims=extra_claims)
+    # Roll out argon2 cost changes gradually, after the response is sent
+    if security.password_needs_rehash(admin.hashed_password):
+        background_tasks.add_task(rehash_password, admin.id, form_data.password, admin.hashed_password)
+
+    # 3. Create Tokens
+    access_token = create_admin_access_token(admin)
+    set_refresh_cookie(response, add_refresh_token(db, admin.id))
+    await db.commit()
     
     logger.info(
         "login_success",
@@ -90,7 +200,7 @@ async def login_access_token(
 
 from pydantic import BaseModel
 from typing import Optional
-from src.api.v1.deps import get_current_admin
+from src.api.v1.deps import get_current_admin, invalidate_principal, Principal
 
 
 class ProfileUpdate(BaseModel):
@@ -105,7 +215,7 @@ class PasswordChange(BaseModel):
 
 @router.get("/me")
 async def get_current_user_profile(
-    current_admin: Admin = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Get current admin's profile (self only)"""
     return {
@@ -124,7 +234,7 @@ async def get_current_user_profile(
 async def update_current_user_profile(
     profile_data: ProfileUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Update current admin's profile (self only)"""
     # Refresh the admin object within the current session
@@ -140,6 +250,7 @@ async def update_current_user_profile(
     
     await db.commit()
     await db.refresh(admin)
+    invalidate_principal(admin.id)
     
     logger.info("Admin profile updated", admin_id=admin.admin_id, updated_fields=list(update_data.keys()))
     
@@ -157,28 +268,142 @@ async def update_current_user_profile(
 @router.put("/me/password")
 async def change_password(
     password_data: PasswordChange,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Change current admin's password (self only)"""
+    # Load the full row - the cached principal never carries the password hash
+    result = await db.execute(select(Admin).filter(Admin.id == current_admin.id))
+    admin = result.scalars().first()
+    
+    if not admin:
+        raise HTTPException(status_code=404, detail="Admin not found")
+    
     # Verify current password
-    if not security.verify_password(password_data.current_password, current_admin.hashed_password):
+    if not await security.verify_password_async(password_data.current_password, admin.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Update password
-    result = await db.execute(select(Admin).filter(Admin.id == current_admin.id))
-    admin = result.scalars().first()
+    admin.hashed_password = await security.get_password_hash_async(password_data.new_password)
     
-    if not admin:
-        raise HTTPException(status_code=404, detail="Admin not found")
-    
-    admin.hashed_password = security.get_password_hash(password_data.new_password)
+    # End every other session in the same transaction. Outstanding refresh
+    # tokens are deleted rather than marked revoked, so a signed-out client
+    # renewing later is not mistaken for token reuse (which would also revoke
+    # the pair issued below). The version bump rejects issued claims tokens.
+    await db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.admin_id == admin.id, RefreshToken.revoked_at.is_(None))
+    )
+    admin.token_version = (admin.token_version or 0) + 1
+    # This session carries on with a fresh pair
+    set_refresh_cookie(response, add_refresh_token(db, admin.id))
     await db.commit()
+    invalidate_principal(admin.id)
+    token_versions.bump(admin.id, admin.token_version, admin.is_active)
     
     logger.info("Admin password changed", admin_id=admin.admin_id)
     
-    return {"message": "Password updated successfully"}
+    return {
+        "message": "Password updated successfully",
+        "access_token": create_admin_access_token(admin),
+        "token_type": "bearer"
+    }
+
 
+@router.post("/refresh", response_model=dict)
+@limiter.limit("10/minute") # Clients renew every ACCESS_TOKEN_EXPIRE_MINUTES
+async def refresh_access_token(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchange the refresh token cookie for a new access token (and a rotated
+    refresh token cookie).
+    
+    Performance: one indexed UPDATE by token hash, no password hashing.
+    Presenting an already-rotated token revokes every session of that admin.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    presented = request.cookies.get(REFRESH_COOKIE)
+    if not presented:
+        raise invalid_exception
+    token_hash = security.hash_refresh_token(presented)
+    now = datetime.now(timezone.utc)
+    
+    # Claim the token atomically: of two requests presenting the same token,
+    # only one gets the row back; the other takes the reuse path below
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now
+        )
+        .values(revoked_at=now)
+        .returning(RefreshToken.admin_id)
+    )
+    admin_pk = result.scalar_one_or_none()
+    
+    if admin_pk is None:
+        result = await db.execute(
+            select(RefreshToken.admin_id, RefreshToken.revoked_at)
+            .filter(RefreshToken.token_hash == token_hash)
+        )
+        stored = result.first()
+        if stored is not None and stored.revoked_at is not None:
+            # Reuse of a rotated token - assume it leaked and end all sessions
+            await db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.admin_id == stored.admin_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            await db.commit()
+            logger.warning("refresh_token_reuse", admin_pk=stored.admin_id)
+        raise invalid_exception
+    
+    result = await db.execute(select(Admin).filter(Admin.id == admin_pk))
+    admin = result.scalars().first()
+    if admin is None or not admin.is_active:
+        # Keep the claimed token revoked
+        await db.commit()
+        raise invalid_exception
+    
+    # Rotate: the presented token is already revoked; issue a new pair
+    set_refresh_cookie(response, add_refresh_token(db, admin.id))
+    await db.commit()
+    
+    return {
+        "access_token": create_admin_access_token(admin),
+        "token_type": "bearer"
+    }
+
+
+@router.delete("/refresh", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Sign out: drop this browser's refresh token and clear its cookie.
+    Served on the cookie's path, the only place the browser sends it.
+    """
+    presented = request.cookies.get(REFRESH_COOKIE)
+    if presented:
+        # Deleted rather than revoked: a revoked token presented again reads as reuse
+        await db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.token_hash == security.hash_refresh_token(presented))
+        )
+        await db.commit()
+    clear_refresh_cookie(response)
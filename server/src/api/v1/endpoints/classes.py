@@ -1,31 +1,31 @@
 """
 Classes CRUD API Endpoints
 """
+import re
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 from typing import Optional, List
 
-from src.db.session import AsyncSessionLocal
+from src.db.session import get_db
+from src.core.typeahead import typeahead
 from src.db.models.school_class import SchoolClass
 from src.db.models.teacher import Teacher
-from src.db.models.admin import Admin
-from src.api.v1.deps import require_permission
+from src.db.models.student import Student
+from src.db.returning import returning_count, returning_lookup
+from src.api.v1.deps import require_permission, Principal
 
 logger = structlog.get_logger()
 router = APIRouter()
 
-# Dependency to get DB session
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
 # Pydantic schemas
 class ClassCreate(BaseModel):
     class_name: str
+    grade: Optional[str] = None  # Defaults to the number in class_name ("Class 10-A" -> "10")
     section: Optional[str] = None
     class_teacher_id: Optional[int] = None
 
@@ -58,10 +58,29 @@ def class_to_response(school_class: SchoolClass) -> dict:
     }
 
 
+# Written row plus teacher name and student count - a write is one INSERT/UPDATE ... RETURNING
+CLASS_RETURNING = (
+    *SchoolClass.__table__.c,
+    returning_lookup(Teacher.name, Teacher.id, SchoolClass.class_teacher_id).label("class_teacher_name"),
+    returning_count(Student.class_id, SchoolClass.id).label("student_count"),
+)
+
+
+def grade_from_class_name(class_name: str) -> str:
+    """First number in the name, as the admin UI groups classes by grade; else the whole name"""
+    match = re.search(r"\d+", class_name)
+    return match.group() if match else class_name
+
+
+def class_row_to_response(row) -> dict:
+    """Convert a CLASS_RETURNING row to response dict"""
+    return {field: row._mapping[field] for field in ClassResponse.model_fields}
+
+
 @router.get("/", response_model=List[ClassResponse])
 async def list_classes(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_classes"))
+    current_admin: Principal = Depends(require_permission("view_classes"))
 ):
     """List all classes"""
     query = select(SchoolClass).options(
@@ -79,7 +98,7 @@ async def list_classes(
 async def get_class(
     class_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_classes"))
+    current_admin: Principal = Depends(require_permission("view_classes"))
 ):
     """Get a single class by ID"""
     query = select(SchoolClass).options(
@@ -103,28 +122,21 @@ async def get_class(
 async def create_class(
     class_data: ClassCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("add_classes"))
+    current_admin: Principal = Depends(require_permission("add_classes"))
 ):
     """Create a new class"""
-    new_class = SchoolClass(
+    result = await db.execute(insert(SchoolClass).values(
         class_name=class_data.class_name,
-        section=class_data.section,
+        grade=class_data.grade or grade_from_class_name(class_data.class_name),
+        section=class_data.section or "",  # NOT NULL column; the UI shows "N/A" for blank
         class_teacher_id=class_data.class_teacher_id
-    )
-    
-    db.add(new_class)
+    ).returning(*CLASS_RETURNING))
+    new_class = result.one()
     await db.commit()
-    
-    # Reload with relationships
-    query = select(SchoolClass).options(
-        selectinload(SchoolClass.class_teacher),
-        selectinload(SchoolClass.students)
-    ).filter(SchoolClass.id == new_class.id)
-    result = await db.execute(query)
-    new_class = result.scalars().first()
+    typeahead.upsert("class", new_class.id, new_class.class_name)
     
     logger.info("Class created", class_name=class_data.class_name)
-    return class_to_response(new_class)
+    return class_row_to_response(new_class)
 
 
 @router.put("/{class_id}", response_model=ClassResponse)
@@ -132,11 +144,21 @@ async def update_class(
     class_id: int,
     class_data: ClassUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("edit_classes"))
+    current_admin: Principal = Depends(require_permission("edit_classes"))
 ):
     """Update a class"""
-    result = await db.execute(select(SchoolClass).filter(SchoolClass.id == class_id))
-    school_class = result.scalars().first()
+    update_data = class_data.model_dump(exclude_unset=True)
+    if update_data:
+        query = (
+            update(SchoolClass)
+            .where(SchoolClass.id == class_id)
+            .values(**update_data)
+            .returning(*CLASS_RETURNING)
+        )
+    else:
+        query = select(*CLASS_RETURNING).where(SchoolClass.id == class_id)
+    result = await db.execute(query)
+    school_class = result.first()
     
     if not school_class:
         raise HTTPException(
@@ -144,29 +166,18 @@ async def update_class(
             detail="Class not found"
         )
     
-    update_data = class_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(school_class, field, value)
-    
     await db.commit()
-    
-    # Reload with relationships
-    query = select(SchoolClass).options(
-        selectinload(SchoolClass.class_teacher),
-        selectinload(SchoolClass.students)
-    ).filter(SchoolClass.id == class_id)
-    result = await db.execute(query)
-    school_class = result.scalars().first()
+    typeahead.upsert("class", school_class.id, school_class.class_name)
     
     logger.info("Class updated", class_id=class_id)
-    return class_to_response(school_class)
+    return class_row_to_response(school_class)
 
 
 @router.delete("/{class_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_class(
     class_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("delete_classes"))
+    current_admin: Principal = Depends(require_permission("delete_classes"))
 ):
     """Delete a class"""
     result = await db.execute(select(SchoolClass).filter(SchoolClass.id == class_id))
@@ -180,6 +191,7 @@ async def delete_class(
     
     await db.delete(school_class)
     await db.commit()
+    typeahead.remove("class", school_class.id)
     
     logger.info("Class deleted", class_id=class_id)
     return None
@@ -10,20 +10,14 @@ from sqlalchemy.future import select
 from pydantic import BaseModel
 from typing import Optional, List
 
-from src.db.session import AsyncSessionLocal
+from src.db.session import get_db
 from src.db.models.contact_request import ContactRequest
-from src.db.models.admin import Admin
-from src.api.v1.deps import get_current_admin
+from src.api.v1.deps import get_current_admin, Principal
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
-
 # Pydantic schemas
 class ContactCreate(BaseModel):
     name: str
@@ -84,7 +78,7 @@ def contact_to_response(contact: ContactRequest) -> dict:
 async def list_contacts(
     status: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """List all contact requests (Admin only)"""
     query = select(ContactRequest).order_by(ContactRequest.created_at.desc())
@@ -101,7 +95,7 @@ async def list_contacts(
 @router.get("/stats/summary")
 async def get_contact_stats(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Get contact request statistics (Admin only)"""
     result = await db.execute(select(ContactRequest))
@@ -122,7 +116,7 @@ async def get_contact_stats(
 async def get_contact(
     contact_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Get a single contact request by ID (Admin only)"""
     query = select(ContactRequest).filter(ContactRequest.id == contact_id)
@@ -167,7 +161,7 @@ async def update_contact(
     contact_id: str,
     contact_data: ContactUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Update a contact request (Admin only)"""
     result = await db.execute(select(ContactRequest).filter(ContactRequest.id == contact_id))
@@ -194,7 +188,7 @@ async def update_contact(
 async def delete_contact(
     contact_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)  # Admin only
+    current_admin: Principal = Depends(get_current_admin)  # Admin only
 ):
     """Delete a contact request (Admin only)"""
     result = await db.execute(select(ContactRequest).filter(ContactRequest.id == contact_id))
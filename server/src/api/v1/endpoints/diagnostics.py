@@ -0,0 +1,55 @@
+"""
+Diagnostics API Endpoints (admin only)
+Runtime numbers for the connection pool, statement caching, in-process caches
+and the last cold start.
+"""
+from fastapi import APIRouter, Depends, Query
+
+from src.db.session import engine, read_engine
+from src.db.pool_metrics import pool_snapshot
+from src.db.statement_stats import statement_stats
+from src.core import security
+from src.core.cold_start import cold_start
+from src.api.v1.deps import require_permission, principal_cache, Principal
+
+router = APIRouter()
+
+
+@router.get("/pool")
+async def get_pool_diagnostics(
+    current_admin: Principal = Depends(require_permission("manage_settings"))
+):
+    """Connection pool state per engine: checkout wait histogram, checked-out, overflow, pre-ping failures"""
+    return {
+        "primary": pool_snapshot(engine),
+        "replica": pool_snapshot(read_engine) if read_engine is not None else None,
+    }
+
+
+@router.get("/statements")
+async def get_statement_diagnostics(
+    limit: int = Query(50, ge=1, le=500),
+    current_admin: Principal = Depends(require_permission("manage_settings"))
+):
+    """Execute and compile counts per SQL statement, busiest first"""
+    return statement_stats.snapshot(limit)
+
+
+@router.get("/caches")
+async def get_cache_diagnostics(
+    current_admin: Principal = Depends(require_permission("manage_settings"))
+):
+    """Hit/miss counters of the auth caches and the password worker pool"""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": security.token_cache.stats(),
+        "password_pool": security.password_pool_stats(),
+    }
+
+
+@router.get("/cold-start")
+async def get_cold_start_diagnostics(
+    current_admin: Principal = Depends(require_permission("manage_settings"))
+):
+    """Milliseconds from the start of the app import to: imports done, ready, DB connected, first response"""
+    return cold_start.snapshot()
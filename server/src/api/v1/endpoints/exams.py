@@ -10,20 +10,14 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date, time
 
-from src.db.session import AsyncSessionLocal
+from src.db.session import get_db
 from src.db.models.exam import Exam
-from src.db.models.admin import Admin
-from src.api.v1.deps import require_permission
+from src.api.v1.deps import require_permission, Principal
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
-
 # Pydantic schemas
 class ExamCreate(BaseModel):
     subject: str
@@ -95,7 +89,7 @@ async def list_exams(
     status: Optional[str] = None,
     grade: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_exams"))
+    current_admin: Principal = Depends(require_permission("view_exams"))
 ):
     """List all exams with optional filters"""
     query = select(Exam).order_by(Exam.exam_date.desc())
@@ -117,7 +111,7 @@ async def list_exams(
 async def get_exam_stats(
     academic_year: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_exams"))
+    current_admin: Principal = Depends(require_permission("view_exams"))
 ):
     """Get exam statistics"""
     query = select(Exam)
@@ -144,7 +138,7 @@ async def get_exam_stats(
 async def get_exam(
     exam_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_exams"))
+    current_admin: Principal = Depends(require_permission("view_exams"))
 ):
     """Get a single exam by ID"""
     query = select(Exam).filter(Exam.id == exam_id)
@@ -164,7 +158,7 @@ async def get_exam(
 async def create_exam(
     exam_data: ExamCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("add_exams"))
+    current_admin: Principal = Depends(require_permission("add_exams"))
 ):
     """Create a new exam"""
     # Parse time strings if provided
@@ -210,7 +204,7 @@ async def update_exam(
     exam_id: str,
     exam_data: ExamUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("edit_exams"))
+    current_admin: Principal = Depends(require_permission("edit_exams"))
 ):
     """Update an exam"""
     result = await db.execute(select(Exam).filter(Exam.id == exam_id))
@@ -251,7 +245,7 @@ async def update_exam(
 async def delete_exam(
     exam_id: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("delete_exams"))
+    current_admin: Principal = Depends(require_permission("delete_exams"))
 ):
     """Delete an exam"""
     result = await db.execute(select(Exam).filter(Exam.id == exam_id))
@@ -1,21 +1,50 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
 import structlog
 from src.db.session import get_db
+from src.db.models.schema_version import SchemaVersion
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Set by the startup DB check (src.main.warm_up_database) when the recorded
+# schema version is older than the code's LATEST_VERSION
+schema_behind = False
+
+
+async def _schema_still_behind(db: AsyncSession) -> dict | None:
+    """Re-read the version, so the instance turns ready once scripts.migrate has run"""
+    global schema_behind
+    from src.db.migrations import LATEST_VERSION  # Only imported while behind
+
+    try:
+        async with db.begin_nested():
+            version = (await db.execute(select(func.max(SchemaVersion.version)))).scalar() or 0
+    except DBAPIError:
+        version = 0  # No schema_version table yet
+    schema_behind = version < LATEST_VERSION
+    return {"schema_version": version, "latest": LATEST_VERSION} if schema_behind else None
+
+
 @router.get("/health")
 async def health_check(db: AsyncSession = Depends(get_db)):
     """
     Health check endpoint to verify service and DB status.
+    Fails readiness (503) while the schema is behind the code, so a deploy
+    that skipped `python -m scripts.migrate` never takes traffic.
     """
     logger.info("Health check called")
     try:
         # Ping DB
         await db.execute(text("SELECT 1"))
+        if schema_behind and (versions := await _schema_still_behind(db)):
+            return JSONResponse(status_code=503, content={
+                "status": "error", "service": "school-p2-backend", "database": "connected",
+                "schema": "behind", **versions,
+            })
         return {"status": "ok", "service": "school-p2-backend", "database": "connected"}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -0,0 +1,62 @@
+"""
+Admin Quick-Search API Endpoint
+Typeahead over students, teachers and classes, served from the in-memory index.
+"""
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+
+from src.core.typeahead import typeahead
+from src.api.v1.deps import get_current_admin, Principal
+
+router = APIRouter()
+
+# Entity kind -> permission needed to see it in suggestions
+KIND_PERMISSIONS = {
+    "student": "view_students",
+    "teacher": "view_teachers",
+    "class": "view_classes",
+}
+
+
+class Suggestion(BaseModel):
+    type: Literal["student", "teacher", "class"]
+    id: int
+    label: str
+    code: Optional[str] = None
+
+
+class SuggestResponse(BaseModel):
+    ready: bool  # False until the index has loaded after startup
+    results: List[Suggestion]
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions"),
+    types: Optional[List[Literal["student", "teacher", "class"]]] = Query(
+        None, description="Restrict to these entity types"
+    ),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """
+    Top matches for a quick-search box, best first: exact, prefix, word
+    prefix, then substring of the name or ID.
+    
+    Performance: no database round trip - trigram set intersections over the
+    in-memory index. Only entity types the admin may view are returned.
+    """
+    kinds = {
+        kind for kind, permission in KIND_PERMISSIONS.items()
+        if current_admin.has_permission(permission) and (not types or kind in types)
+    }
+    entries = typeahead.suggest(q, limit, kinds) if kinds else []
+    return {
+        "ready": typeahead.loaded,
+        "results": [
+            {"type": entry.kind, "id": entry.id, "label": entry.label, "code": entry.code}
+            for entry in entries
+        ],
+    }
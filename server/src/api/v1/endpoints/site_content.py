@@ -7,15 +7,14 @@ import time
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, update
 from pydantic import BaseModel
 from typing import Optional, List, Any, Dict
 from datetime import datetime
 
 from src.db.session import get_db
 from src.db.models.site_page_content import SitePageContent
-from src.db.models.admin import Admin
-from src.api.v1.deps import require_permission
+from src.api.v1.deps import require_permission, Principal
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -86,7 +85,7 @@ class PageSummary(BaseModel):
 @router.get("/pages", response_model=List[PageSummary])
 async def list_pages(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """List all unique pages with their section counts"""
     query = select(
@@ -119,29 +118,15 @@ async def get_public_page_content(
         return cached
     
     # Cache miss - query database (O(log n) with index)
-    query = select(SitePageContent).filter(
+    query = lambda_stmt(lambda: select(SitePageContent).filter(
         SitePageContent.page_slug == page_slug,
         SitePageContent.is_active == True
-    ).order_by(SitePageContent.order_index)
+    ).order_by(SitePageContent.order_index))
     
     result = await db.execute(query)
     sections = result.scalars().all()
     
-    response = []
-    for section in sections:
-        content = section.content
-        if isinstance(content, str):
-            content = json.loads(content)
-        response.append({
-            "id": section.id,
-            "page_slug": section.page_slug,
-            "section_key": section.section_key,
-            "content": content,
-            "order_index": section.order_index,
-            "is_active": section.is_active,
-            "created_at": section.created_at,
-            "updated_at": section.updated_at
-        })
+    response = [_public_section(section) for section in sections]
     
     # Store in cache for future requests
     set_cached_page(page_slug, response)
@@ -149,13 +134,50 @@ async def get_public_page_content(
     
     return response
 
+def _public_section(section: SitePageContent) -> dict:
+    content = section.content
+    if isinstance(content, str):
+        content = json.loads(content)
+    return {
+        "id": section.id,
+        "page_slug": section.page_slug,
+        "section_key": section.section_key,
+        "content": content,
+        "order_index": section.order_index,
+        "is_active": section.is_active,
+        "created_at": section.created_at,
+        "updated_at": section.updated_at
+    }
+
+
+async def warm_page_cache(db: AsyncSession, page_slugs: List[str]) -> int:
+    """
+    Preload the public cache for several pages with one query (startup warm-up).
+    Pages without active sections are cached empty, like the endpoint does.
+    Returns the number of sections loaded.
+    """
+    result = await db.execute(
+        select(SitePageContent).filter(
+            SitePageContent.page_slug.in_(page_slugs),
+            SitePageContent.is_active == True
+        ).order_by(SitePageContent.page_slug, SitePageContent.order_index)
+    )
+    sections = result.scalars().all()
+    
+    pages: Dict[str, List[dict]] = {slug: [] for slug in page_slugs}
+    for section in sections:
+        pages[section.page_slug].append(_public_section(section))
+    for slug, data in pages.items():
+        set_cached_page(slug, data)
+    return len(sections)
+
 # ==================== ADMIN ENDPOINTS (Auth Required) ====================
 
 @router.get("/pages/{page_slug}", response_model=List[PageContentResponse])
 async def get_page_sections(
     page_slug: str,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """Get all sections for a specific page"""
     query = select(SitePageContent).filter(
@@ -187,7 +209,7 @@ async def get_page_sections(
 async def get_section(
     section_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """Get a single section by ID"""
     query = select(SitePageContent).filter(SitePageContent.id == section_id)
@@ -216,7 +238,7 @@ async def get_section(
 async def create_section(
     data: PageContentCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """Create a new section"""
     new_section = SitePageContent(
@@ -229,7 +251,6 @@ async def create_section(
     
     db.add(new_section)
     await db.commit()
-    await db.refresh(new_section)
     
     # Invalidate cache for this page
     invalidate_cache(data.page_slug)
@@ -252,24 +273,28 @@ async def update_section(
     section_id: int,
     data: PageContentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """Update a section"""
-    result = await db.execute(select(SitePageContent).filter(SitePageContent.id == section_id))
+    update_data = data.model_dump(exclude_none=True)
+    if "content" in update_data:
+        update_data["content"] = json.dumps(update_data["content"])
+    if update_data:
+        query = (
+            update(SitePageContent)
+            .where(SitePageContent.id == section_id)
+            .values(**update_data)
+            .returning(SitePageContent)
+        )
+    else:
+        query = select(SitePageContent).filter(SitePageContent.id == section_id)
+    result = await db.execute(query)
     section = result.scalars().first()
     
     if not section:
         raise HTTPException(status_code=404, detail="Section not found")
     
-    if data.content is not None:
-        section.content = json.dumps(data.content)
-    if data.order_index is not None:
-        section.order_index = data.order_index
-    if data.is_active is not None:
-        section.is_active = data.is_active
-    
     await db.commit()
-    await db.refresh(section)
     
     # Invalidate cache for this page
     invalidate_cache(section.page_slug)
@@ -295,7 +320,7 @@ async def update_section(
 async def delete_section(
     section_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """Delete a section"""
     result = await db.execute(select(SitePageContent).filter(SitePageContent.id == section_id))
@@ -315,102 +340,8 @@ async def delete_section(
     return None
 
 # ==================== SEED ENDPOINTS ====================
-ADMISSIONS_SEED_DATA = [
-    {
-        "page_slug": "admissions",
-        "section_key": "hero",
-        "order_index": 0,
-        "is_active": True,
-        "content": {
-            "tagline": "Join Our Community",
-            "title": "Admissions Open",
-            "subtitle": "Begin your journey towards academic excellence and personal growth for the 2024-25 academic year.",
-            "image": "https://images.unsplash.com/photo-1523050854058-8df90110c9f1?q=80&w=2670&auto=format&fit=crop"
-        }
-    },
-    {
-        "page_slug": "admissions",
-        "section_key": "process",
-        "order_index": 1,
-        "is_active": True,
-        "content": {
-            "tagline": "How to Apply",
-            "title": "Admission Process",
-            "steps": [
-                {"id": 1, "title": "Submit Application", "desc": "Complete the online application form with personal details and academic history.", "icon": "FileText"},
-                {"id": 2, "title": "Entrance Assessment", "desc": "Participate in a written assessment or interview tailored to the grade level.", "icon": "UserCheck"},
-                {"id": 3, "title": "Document Verification", "desc": "Submit necessary documents including transcripts and birth certificates for verification.", "icon": "School"},
-                {"id": 4, "title": "Fee Payment & Enrollment", "desc": "Upon selection, secure your seat by paying the admission fee to confirm enrollment.", "icon": "CreditCard"}
-            ]
-        }
-    },
-    {
-        "page_slug": "admissions",
-        "section_key": "requirements",
-        "order_index": 2,
-        "is_active": True,
-        "content": {
-            "tagline": "Checklist",
-            "title": "Required Documents",
-            "image": "https://images.unsplash.com/photo-1454165804606-c3d57bc86b40?q=80&w=1200&auto=format&fit=crop",
-            "requirements": [
-                {"icon": "FileText", "text": "Completed Application Form", "subtext": "With 2 passport-size recent photos"},
-                {"icon": "GraduationCap", "text": "Official Transcripts", "subtext": "Report cards from previous school (Last 2 years)"},
-                {"icon": "Baby", "text": "Birth Certificate", "subtext": "Original required for verification"},
-                {"icon": "School", "text": "Transfer Certificate (TC)", "subtext": "Issued by the previous school authority"},
-                {"icon": "HeartPulse", "text": "Medical Fitness Certificate", "subtext": "Signed by a registered practitioner"},
-                {"icon": "CreditCard", "text": "Identity Proof", "subtext": "Aadhar Card copy of student & parents"},
-                {"icon": "Plane", "text": "Passport Copy", "subtext": "Mandatory for international students"}
-            ]
-        }
-    },
-    {
-        "page_slug": "admissions",
-        "section_key": "downloads",
-        "order_index": 3,
-        "is_active": True,
-        "content": {
-            "tagline": "Resources",
-            "title": "Downloadable Forms",
-            "documents": [
-                {"title": "Admission Application Form", "size": "1.2 MB", "desc": "Main application form for all grades.", "url": "#"},
-                {"title": "Fee Structure 2024-25", "size": "850 KB", "desc": "Detailed breakdown of tuition and other fees.", "url": "#"},
-                {"title": "School Prospectus", "size": "4.5 MB", "desc": "Overview of our vision, mission, and facilities.", "url": "#"},
-                {"title": "Transport Request Form", "size": "500 KB", "desc": "Bus route application and guidelines.", "url": "#"}
-            ]
-        }
-    },
-    {
-        "page_slug": "admissions",
-        "section_key": "faq",
-        "order_index": 4,
-        "is_active": True,
-        "content": {
-            "tagline": "Support",
-            "title": "Frequently Asked Questions",
-            "intro": "Finiding the right school is a big decision. Here are answers to some common queries to help you make an informed choice.",
-            "faqs": [
-                {"question": "What is the age criteria for Kindergarten admission?", "answer": "For Kindergarten (KG-1), the child should be 4 years old as of June 1st of the academic year. For Nursery, the minimum age is 3 years."},
-                {"question": "Is there an entrance test for all grades?", "answer": "Entrance assessments are conducted for Grade 1 onwards to understand the student's proficiency in English, Mathematics, and Science. For Kindergarten, we have a friendly interaction session."},
-                {"question": "Do you offer school transport facilities?", "answer": "Yes, we have a fleet of GPS-enabled buses covering a radius of 25km from the school campus. Route details and fee structure can be obtained from the transport office."},
-                {"question": "What is the student-teacher ratio?", "answer": "We maintain a healthy student-teacher ratio of 25:1 to ensure personalized attention and effective learning for every child."},
-                {"question": "Are there any scholarships available?", "answer": "Yes, merit-based scholarships are available for deserving students from Grade 8 onwards, as well as for outstanding achievements in sports and arts."}
-            ]
-        }
-    },
-    {
-        "page_slug": "admissions",
-        "section_key": "cta",
-        "order_index": 5,
-        "is_active": True,
-        "content": {
-            "title": "Ready to Join Us?",
-            "subtitle": "Applications for the 2024-25 academic session are now open. Secure your child's future with EduNet School.",
-            "primary_button": {"text": "Apply Online Now", "url": "/apply"},
-            "secondary_button": {"text": "Contact Admissions", "url": "/contact"}
-        }
-    }
-]
+# Seed data lives in src.db.site_content_seed and is imported on first use,
+# keeping it out of the import path of every cold start
 
 
 # Temporary public seed endpoint (for initial setup only)
@@ -419,6 +350,7 @@ async def seed_admissions_public(
     db: AsyncSession = Depends(get_db)
 ):
     """Seed admissions page content - NO AUTH REQUIRED (temporary for setup)"""
+    from src.db.site_content_seed import ADMISSIONS_SEED_DATA
     try:
         # Delete existing admissions content
         existing = await db.execute(
@@ -453,9 +385,10 @@ async def seed_admissions_public(
 @router.post("/seed/admissions")
 async def seed_admissions_content(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("manage_site_content"))
+    current_admin: Principal = Depends(require_permission("manage_site_content"))
 ):
     """Seed admissions page content - deletes existing and creates new"""
+    from src.db.site_content_seed import ADMISSIONS_SEED_DATA
     # Delete existing admissions content
     existing = await db.execute(
         select(SitePageContent).where(SitePageContent.page_slug == "admissions")
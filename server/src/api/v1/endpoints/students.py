@@ -1,29 +1,35 @@
 """
 Students CRUD API Endpoints
 """
+import asyncio
+import time
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, lambda_stmt, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ValidationError
+from typing import Literal, Optional, List
 from datetime import date
 
-from src.db.session import AsyncSessionLocal
+from src.core.config import settings
+from src.core.tabular import TabularFileError, iter_rows, read_batch
+from src.db.session import get_db
+from src.core.typeahead import typeahead
 from src.db.models.student import Student
 from src.db.models.school_class import SchoolClass
-from src.db.models.admin import Admin
-from src.api.v1.deps import require_permission
+from src.db.returning import returning_lookup
+from src.db.search import student_search
+from src.db.public_ids import student_numbers, format_student_id, format_admission_id, insert_numbered
+from src.api.v1.deps import require_permission, Principal
+from src.api.v1.export import ExportFormat, stream_export
+from src.api.v1.pagination import decode_cursor, reject_offset_with_cursor, resolve_sort, set_next_cursor
 
 logger = structlog.get_logger()
 router = APIRouter()
 
-# Dependency to get DB session
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
 # Pydantic schemas
 class StudentCreate(BaseModel):
     name: str
@@ -97,6 +103,22 @@ class StudentResponse(BaseModel):
         from_attributes = True
 
 
+class ImportRowError(BaseModel):
+    row: int  # Line (CSV) or row (XLSX) number in the file
+    errors: List[str]
+
+
+class StudentImportResult(BaseModel):
+    rows: int
+    inserted: int
+    failed: int
+    dry_run: bool
+    errors: List[ImportRowError]
+    errors_truncated: bool  # More rows failed than STUDENT_IMPORT_MAX_ERRORS
+    elapsed_ms: float
+    rows_per_second: float
+
+
 def student_to_response(student: Student) -> dict:
     """Convert Student model to response dict with class_name"""
     data = {
@@ -125,50 +147,130 @@ def student_to_response(student: Student) -> dict:
     return data
 
 
+# Written row plus its class name - a write is one INSERT/UPDATE ... RETURNING
+STUDENT_RETURNING = (
+    *Student.__table__.c,
+    returning_lookup(SchoolClass.class_name, SchoolClass.id, Student.class_id).label("class_name"),
+)
+
+
+def student_row_to_response(row) -> dict:
+    """Convert a STUDENT_RETURNING row to response dict"""
+    return {field: row._mapping[field] for field in StudentResponse.model_fields}
+
+
 @router.get("/", response_model=List[StudentResponse])
 async def list_students(
+    response: Response,
     class_id: Optional[int] = Query(None, description="Filter by class ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    search: Optional[str] = Query(None, description="Search by name or student_id"),
+    search: Optional[str] = Query(
+        None, min_length=settings.SEARCH_MIN_LENGTH, description="Substring of name or student_id"
+    ),
+    sort: Optional[Literal["id", "name", "relevance"]] = Query(
+        None, description="Order by id, name or search relevance (default: relevance when searching, else id)"
+    ),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor: page after it"),
     limit: int = Query(50, ge=1, le=200, description="Max results (1-200)"),
-    offset: int = Query(0, ge=0, description="Skip N results for pagination"),
+    offset: int = Query(0, ge=0, description="Skip N results (prefer after for deep pages)"),
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_students"))
+    current_admin: Principal = Depends(require_permission("view_students"))
 ):
     """
     List all students with optional filters.
     
     Performance: O(log n) queries with indexed filters and pagination.
-    Uses composite indexes on (class_id, is_active) and (name).
+    Uses composite indexes on (class_id, is_active) and (is_active, name);
+    search uses the trigram indexes and ranks by similarity.
+    Built as a lambda statement, so each filter combination is compiled once.
+    
+    Pagination: a full page sets X-Next-Cursor; pass it back as `after` to
+    seek straight to the next page instead of skipping `offset` rows.
     """
-    query = select(Student).options(selectinload(Student.school_class))
+    reject_offset_with_cursor(after, offset)
+    sort = resolve_sort(sort, search, after)
+    query = lambda_stmt(lambda: select(Student).options(selectinload(Student.school_class)))
     
     if class_id:
-        query = query.filter(Student.class_id == class_id)
+        query += lambda q: q.filter(Student.class_id == class_id)
     if is_active is not None:
-        query = query.filter(Student.is_active == is_active)
+        query += lambda q: q.filter(Student.is_active == is_active)
     if search:
-        query = query.filter(
-            (Student.name.ilike(f"%{search}%")) | 
-            (Student.student_id.ilike(f"%{search}%"))
-        )
+        # Trigram-indexed (src/db/search.py); built outside the lambda because
+        # its shape depends on the database
+        matches = student_search.matches(search)
+        query += lambda q: q.filter(matches)
     
-    # Apply pagination with limit/offset
-    query = query.order_by(Student.id).offset(offset).limit(limit)
+    # Searches rank by relevance; otherwise seek past the cursor's row and
+    # order by the same key
+    if sort == "relevance":
+        ranking = student_search.ranking(search)
+        query += lambda q: q.order_by(*ranking)
+    elif sort == "name":
+        if after is not None:
+            after_name, after_id = decode_cursor(after, sort, (str, int))
+            query += lambda q: q.filter(tuple_(Student.name, Student.id) > tuple_(after_name, after_id))
+        query += lambda q: q.order_by(Student.name, Student.id)
+    else:
+        if after is not None:
+            (after_id,) = decode_cursor(after, sort, (int,))
+            query += lambda q: q.filter(Student.id > after_id)
+        query += lambda q: q.order_by(Student.id)
+    
+    query += lambda q: q.offset(offset).limit(limit)
     result = await db.execute(query)
     students = result.scalars().all()
     
+    set_next_cursor(
+        response, students, limit, sort,
+        lambda s: [s.name, s.id] if sort == "name" else [s.id]
+    )
     return [student_to_response(s) for s in students]
 
 
+@router.get("/export")
+async def export_students(
+    request: Request,
+    format: ExportFormat = Query("csv", description="csv or ndjson"),
+    class_id: Optional[int] = Query(None, description="Filter by class ID"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    search: Optional[str] = Query(
+        None, min_length=settings.SEARCH_MIN_LENGTH, description="Substring of name or student_id"
+    ),
+    current_admin: Principal = Depends(require_permission("view_students"))
+):
+    """
+    Export all matching students (same filters as the list, no pagination).
+    
+    Performance: streamed from a server-side cursor in EXPORT_BATCH_SIZE
+    partitions; constant memory for any roster size.
+    """
+    query = (
+        select(*Student.__table__.c, SchoolClass.class_name)
+        .outerjoin(SchoolClass, Student.class_id == SchoolClass.id)
+        .order_by(Student.id)
+    )
+    if class_id:
+        query = query.filter(Student.class_id == class_id)
+    if is_active is not None:
+        query = query.filter(Student.is_active == is_active)
+    if search:
+        query = query.filter(student_search.matches(search))
+    
+    logger.info("Students export", format=format, admin=current_admin.username)
+    return stream_export(request, query, format, f"students-{date.today():%Y%m%d}")
+
+
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student(
     student_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_students"))
+    current_admin: Principal = Depends(require_permission("view_students"))
 ):
     """Get a single student by ID"""
-    query = select(Student).options(selectinload(Student.school_class)).filter(Student.id == student_id)
+    query = lambda_stmt(
+        lambda: select(Student).options(selectinload(Student.school_class)).filter(Student.id == student_id)
+    )
     result = await db.execute(query)
     student = result.scalars().first()
     
@@ -185,22 +287,14 @@ async def get_student(
 async def create_student(
     student_data: StudentCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("add_students"))
+    current_admin: Principal = Depends(require_permission("add_students"))
 ):
     """Create a new student"""
-    # Generate student_id
-    result = await db.execute(select(Student).order_by(Student.id.desc()).limit(1))
-    last_student = result.scalars().first()
-    next_id = (last_student.id + 1) if last_student else 1
-    student_id = f"ST-{next_id:03d}"
-    
-    # Generate admission_id if not provided
-    admission_id = student_data.admission_id
-    if not admission_id:
-        admission_id = f"ADM-2024-{next_id:03d}"
-    
-    new_student = Student(
-        student_id=student_id,
+    # Generate student_id (and admission_id if not provided) from the shared
+    # sequence; on Postgres the INSERT draws the number itself
+    number = await student_numbers.next(db)
+    numbered = {"student_id": format_student_id}
+    values = dict(
         roll_no=student_data.roll_no,
         name=student_data.name,
         class_id=student_data.class_id,
@@ -209,7 +303,6 @@ async def create_student(
         gender=student_data.gender,
         blood_group=student_data.blood_group,
         religion=student_data.religion,
-        admission_id=admission_id,
         father_name=student_data.father_name,
         father_occupation=student_data.father_occupation,
         mother_name=student_data.mother_name,
@@ -220,17 +313,20 @@ async def create_student(
         profile_image=student_data.profile_image,
         is_active=True
     )
+    if student_data.admission_id:
+        values["admission_id"] = student_data.admission_id
+    else:
+        numbered["admission_id"] = format_admission_id
     
-    db.add(new_student)
+    result = await db.execute(
+        insert_numbered(Student, values, number, numbered).returning(*STUDENT_RETURNING)
+    )
+    new_student = result.one()
     await db.commit()
+    typeahead.upsert("student", new_student.id, new_student.name, new_student.student_id)
     
-    # Reload with relationship
-    query = select(Student).options(selectinload(Student.school_class)).filter(Student.id == new_student.id)
-    result = await db.execute(query)
-    new_student = result.scalars().first()
-    
-    logger.info("Student created", student_id=student_id, name=student_data.name)
-    return student_to_response(new_student)
+    logger.info("Student created", student_id=new_student.student_id, name=student_data.name)
+    return student_row_to_response(new_student)
 
 
 @router.put("/{student_id}", response_model=StudentResponse)
@@ -238,12 +334,21 @@ async def update_student(
     student_id: int,
     student_data: StudentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("edit_students"))
+    current_admin: Principal = Depends(require_permission("edit_students"))
 ):
     """Update a student"""
-    query = select(Student).options(selectinload(Student.school_class)).filter(Student.id == student_id)
+    update_data = student_data.model_dump(exclude_unset=True)
+    if update_data:
+        query = (
+            update(Student)
+            .where(Student.id == student_id)
+            .values(**update_data)
+            .returning(*STUDENT_RETURNING)
+        )
+    else:
+        query = select(*STUDENT_RETURNING).where(Student.id == student_id)
     result = await db.execute(query)
-    student = result.scalars().first()
+    student = result.first()
     
     if not student:
         raise HTTPException(
@@ -251,27 +356,18 @@ async def update_student(
             detail="Student not found"
         )
     
-    # Update fields
-    update_data = student_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(student, field, value)
-    
     await db.commit()
-    
-    # Reload with relationship
-    query = select(Student).options(selectinload(Student.school_class)).filter(Student.id == student_id)
-    result = await db.execute(query)
-    student = result.scalars().first()
+    typeahead.upsert("student", student.id, student.name, student.student_id)
     
     logger.info("Student updated", student_id=student.student_id)
-    return student_to_response(student)
+    return student_row_to_response(student)
 
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_student(
     student_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("delete_students"))
+    current_admin: Principal = Depends(require_permission("delete_students"))
 ):
     """Delete a student"""
     result = await db.execute(select(Student).filter(Student.id == student_id))
@@ -285,15 +381,168 @@ async def delete_student(
     
     await db.delete(student)
     await db.commit()
+    typeahead.remove("student", student.id)
     
     logger.info("Student deleted", student_id=student.student_id)
     return None
 
 
+class _ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def reject(self, row: int, errors: List[str]):
+        self.failed += 1
+        if len(self.errors) < settings.STUDENT_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+
+def _validate_import_row(values: dict, class_ids_by_name: dict, class_ids: set):
+    """(StudentCreate, None) or (None, error messages) for one file row"""
+    class_name = values.pop("class_name", None) or values.pop("class", None)
+    if class_name and not values.get("class_id"):
+        class_id = class_ids_by_name.get(str(class_name).lower())
+        if class_id is None:
+            return None, [f"class_name: unknown class '{class_name}'"]
+        values["class_id"] = class_id
+    try:
+        student = StudentCreate(**values)
+    except ValidationError as e:
+        return None, [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+    if student.class_id is not None and student.class_id not in class_ids:
+        return None, [f"class_id: no class with id {student.class_id}"]
+    return student, None
+
+
+STUDENTS_TABLE = Student.__table__
+IMPORT_RETURNING = (STUDENTS_TABLE.c.id, STUDENTS_TABLE.c.name, STUDENTS_TABLE.c.student_id)
+
+
+def _import_record(student: StudentCreate, number: int) -> dict:
+    record = student.model_dump()
+    record["student_id"] = format_student_id(number)
+    record["admission_id"] = record["admission_id"] or format_admission_id(number)
+    record["is_active"] = True
+    return record
+
+
+async def _insert_import_batch(db: AsyncSession, valid: list, report: _ImportReport) -> list:
+    """Insert validated (row, StudentCreate) pairs; returns the inserted (id, name, student_id) rows"""
+    numbers = await student_numbers.reserve(db, len(valid))
+    records = [_import_record(student, number) for (_, student), number in zip(valid, numbers)]
+
+    try:
+        # Core executemany: SQLAlchemy sends multi-row INSERT ... RETURNING
+        # statements (the ORM bulk path would insert row by row here)
+        result = await db.execute(insert(STUDENTS_TABLE).returning(*IMPORT_RETURNING), records)
+        inserted = result.all()
+        await db.commit()
+        return inserted
+    except IntegrityError:
+        await db.rollback()
+
+    # A constraint failed (e.g. duplicate admission_id): retry row by row to find the culprits.
+    # The rollback also undid the reservation on SQLite, so draw the numbers
+    # again and commit them before any per-row rollback.
+    numbers = await student_numbers.reserve(db, len(valid))
+    await db.commit()
+    inserted = []
+    for (row, student), number in zip(valid, numbers):
+        record = _import_record(student, number)
+        try:
+            result = await db.execute(insert(STUDENTS_TABLE).values(**record).returning(*IMPORT_RETURNING))
+            inserted.append(result.one())
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            report.reject(row, [f"rejected by the database: {e.orig}"])
+    return inserted
+
+
+@router.post("/import", response_model=StudentImportResult)
+async def import_students(
+    file: UploadFile = File(..., description="CSV or XLSX with a header row"),
+    dry_run: bool = Query(False, description="Validate only, insert nothing"),
+    db: AsyncSession = Depends(get_db),
+    current_admin: Principal = Depends(require_permission("add_students"))
+):
+    """
+    Bulk-create students from a CSV or XLSX upload.
+    
+    Columns are the StudentCreate fields (headers are case-insensitive,
+    "Father Name" works); `class_name` may stand in for `class_id`.
+    
+    Performance: the file is streamed in batches of STUDENT_IMPORT_BATCH_SIZE
+    rows, so memory stays flat for any file size. Per batch: rows validated,
+    student_ids reserved in one statement, one multi-row INSERT, one commit.
+    Committed batches stay if a later row fails; failing rows are reported
+    by file row number.
+    """
+    start = time.perf_counter()
+    try:
+        rows = iter_rows(file.file, file.filename, file.content_type)
+    except TabularFileError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    classes = await db.execute(select(SchoolClass.id, SchoolClass.class_name))
+    class_ids_by_name = {name.lower(): class_id for class_id, name in classes.all()}
+    class_ids = set(class_ids_by_name.values())
+    
+    report = _ImportReport()
+    while True:
+        try:
+            # File parsing blocks; run it off the event loop
+            batch = await asyncio.to_thread(read_batch, rows, settings.STUDENT_IMPORT_BATCH_SIZE)
+        except TabularFileError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{e} (stopped after {report.rows} rows, {report.inserted} imported)"
+            )
+        if not batch:
+            break
+        
+        valid = []
+        for row, values in batch:
+            report.rows += 1
+            student, errors = _validate_import_row(values, class_ids_by_name, class_ids)
+            if errors:
+                report.reject(row, errors)
+            else:
+                valid.append((row, student))
+        
+        if valid and not dry_run:
+            for inserted in await _insert_import_batch(db, valid, report):
+                typeahead.upsert("student", inserted.id, inserted.name, inserted.student_id)
+                report.inserted += 1
+    
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Students imported",
+        rows=report.rows,
+        inserted=report.inserted,
+        failed=report.failed,
+        dry_run=dry_run,
+        ms=round(elapsed * 1000, 1)
+    )
+    return {
+        "rows": report.rows,
+        "inserted": report.inserted,
+        "failed": report.failed,
+        "dry_run": dry_run,
+        "errors": report.errors,
+        "errors_truncated": report.failed > len(report.errors),
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "rows_per_second": round(report.rows / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
 @router.get("/stats/summary")
 async def get_student_stats(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_students"))
+    current_admin: Principal = Depends(require_permission("view_students"))
 ):
     """
     Get student statistics.
@@ -2,27 +2,30 @@
 Teachers CRUD API Endpoints
 """
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import tuple_, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import date
 
-from src.db.session import AsyncSessionLocal
+from src.core.config import settings
+from src.db.session import get_db
+from src.core.typeahead import typeahead
 from src.db.models.teacher import Teacher
-from src.db.models.admin import Admin
-from src.api.v1.deps import require_permission
+from src.db.models.school_class import SchoolClass
+from src.db.returning import returning_string_list, split_string_list
+from src.db.search import teacher_search
+from src.db.public_ids import teacher_numbers, format_employee_id, insert_numbered
+from src.api.v1.deps import require_permission, Principal
+from src.api.v1.export import ExportFormat, stream_export
+from src.api.v1.pagination import decode_cursor, reject_offset_with_cursor, resolve_sort, set_next_cursor
 
 logger = structlog.get_logger()
 router = APIRouter()
 
-# Dependency to get DB session
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
-
 # Pydantic schemas
 class TeacherCreate(BaseModel):
     name: str
@@ -105,22 +108,49 @@ def teacher_to_response(teacher: Teacher) -> dict:
     }
 
 
+# Written row plus its assigned class names - a write is one INSERT/UPDATE ... RETURNING
+TEACHER_RETURNING = (
+    *Teacher.__table__.c,
+    returning_string_list(SchoolClass.class_name, SchoolClass.class_teacher_id, Teacher.id).label("assigned_class_names"),
+)
+
+
+def teacher_row_to_response(row) -> dict:
+    """Convert a TEACHER_RETURNING row to response dict"""
+    data = {field: row._mapping[field] for field in TeacherResponse.model_fields}
+    data["assigned_class_names"] = split_string_list(row.assigned_class_names)
+    return data
+
+
 @router.get("/", response_model=List[TeacherResponse])
 async def list_teachers(
+    response: Response,
     department: Optional[str] = Query(None, description="Filter by department"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    search: Optional[str] = Query(None, description="Search by name or employee_id"),
+    search: Optional[str] = Query(
+        None, min_length=settings.SEARCH_MIN_LENGTH, description="Substring of name or employee_id"
+    ),
+    sort: Optional[Literal["id", "name", "relevance"]] = Query(
+        None, description="Order by id, name or search relevance (default: relevance when searching, else id)"
+    ),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor: page after it"),
     limit: int = Query(50, ge=1, le=200, description="Max results (1-200)"),
-    offset: int = Query(0, ge=0, description="Skip N results for pagination"),
+    offset: int = Query(0, ge=0, description="Skip N results (prefer after for deep pages)"),
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_teachers"))
+    current_admin: Principal = Depends(require_permission("view_teachers"))
 ):
     """
     List all teachers with optional filters.
     
     Performance: O(log n) queries with indexed filters and pagination.
-    Uses composite indexes on (department, is_active) and (name).
+    Uses composite indexes on (department, is_active) and (is_active, name);
+    search uses the trigram indexes and ranks by similarity.
+    
+    Pagination: a full page sets X-Next-Cursor; pass it back as `after` to
+    seek straight to the next page instead of skipping `offset` rows.
     """
+    reject_offset_with_cursor(after, offset)
+    sort = resolve_sort(sort, search, after)
     query = select(Teacher).options(selectinload(Teacher.assigned_classes))
     
     if department:
@@ -128,23 +158,39 @@ async def list_teachers(
     if is_active is not None:
         query = query.filter(Teacher.is_active == is_active)
     if search:
-        query = query.filter(
-            (Teacher.name.ilike(f"%{search}%")) | 
-            (Teacher.employee_id.ilike(f"%{search}%"))
-        )
+        query = query.filter(teacher_search.matches(search))
+    
+    # Searches rank by relevance; otherwise seek past the cursor's row and
+    # order by the same key
+    if sort == "relevance":
+        ranking = teacher_search.ranking(search)
+        query = query.order_by(*ranking)
+    elif sort == "name":
+        if after is not None:
+            after_name, after_id = decode_cursor(after, sort, (str, int))
+            query = query.filter(tuple_(Teacher.name, Teacher.id) > tuple_(after_name, after_id))
+        query = query.order_by(Teacher.name, Teacher.id)
+    else:
+        if after is not None:
+            (after_id,) = decode_cursor(after, sort, (int,))
+            query = query.filter(Teacher.id > after_id)
+        query = query.order_by(Teacher.id)
     
-    # Apply pagination with limit/offset
-    query = query.order_by(Teacher.id).offset(offset).limit(limit)
+    query = query.offset(offset).limit(limit)
     result = await db.execute(query)
     teachers = result.scalars().all()
     
+    set_next_cursor(
+        response, teachers, limit, sort,
+        lambda t: [t.name, t.id] if sort == "name" else [t.id]
+    )
     return [teacher_to_response(t) for t in teachers]
 
 
 @router.get("/stats/summary")
 async def get_teacher_stats(
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_teachers"))
+    current_admin: Principal = Depends(require_permission("view_teachers"))
 ):
     """
     Get teacher statistics.
@@ -184,11 +230,47 @@ async def get_teacher_stats(
     }
 
 
+def _split_assigned_classes(record: dict) -> dict:
+    record["assigned_class_names"] = split_string_list(record["assigned_class_names"])
+    return record
+
+
+@router.get("/export")
+async def export_teachers(
+    request: Request,
+    format: ExportFormat = Query("csv", description="csv or ndjson"),
+    department: Optional[str] = Query(None, description="Filter by department"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    search: Optional[str] = Query(
+        None, min_length=settings.SEARCH_MIN_LENGTH, description="Substring of name or employee_id"
+    ),
+    current_admin: Principal = Depends(require_permission("view_teachers"))
+):
+    """
+    Export all matching teachers (same filters as the list, no pagination).
+    
+    Performance: streamed from a server-side cursor in EXPORT_BATCH_SIZE
+    partitions; constant memory for any staff size.
+    """
+    query = select(*TEACHER_RETURNING).order_by(Teacher.id)
+    if department:
+        query = query.filter(Teacher.department == department)
+    if is_active is not None:
+        query = query.filter(Teacher.is_active == is_active)
+    if search:
+        query = query.filter(teacher_search.matches(search))
+    
+    logger.info("Teachers export", format=format, admin=current_admin.username)
+    return stream_export(
+        request, query, format, f"teachers-{date.today():%Y%m%d}", transform=_split_assigned_classes
+    )
+
+
 @router.get("/{teacher_id}", response_model=TeacherResponse)
 async def get_teacher(
     teacher_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("view_teachers"))
+    current_admin: Principal = Depends(require_permission("view_teachers"))
 ):
     """Get a single teacher by ID"""
     query = select(Teacher).options(selectinload(Teacher.assigned_classes)).filter(Teacher.id == teacher_id)
@@ -208,17 +290,12 @@ async def get_teacher(
 async def create_teacher(
     teacher_data: TeacherCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("add_teachers"))
+    current_admin: Principal = Depends(require_permission("add_teachers"))
 ):
     """Create a new teacher"""
-    # Generate employee_id
-    result = await db.execute(select(Teacher).order_by(Teacher.id.desc()).limit(1))
-    last_teacher = result.scalars().first()
-    next_id = (last_teacher.id + 1) if last_teacher else 1
-    employee_id = f"EMP-{next_id:04d}"
-    
-    new_teacher = Teacher(
-        employee_id=employee_id,
+    # Generate employee_id from the shared sequence; on Postgres the INSERT draws the number itself
+    number = await teacher_numbers.next(db)
+    values = dict(
         name=teacher_data.name,
         subject=teacher_data.subject,
         department=teacher_data.department,
@@ -236,16 +313,16 @@ async def create_teacher(
         is_active=True
     )
     
-    db.add(new_teacher)
+    result = await db.execute(
+        insert_numbered(Teacher, values, number, {"employee_id": format_employee_id})
+        .returning(*TEACHER_RETURNING)
+    )
+    new_teacher = result.one()
     await db.commit()
+    typeahead.upsert("teacher", new_teacher.id, new_teacher.name, new_teacher.employee_id)
     
-    # Reload with relationship
-    query = select(Teacher).options(selectinload(Teacher.assigned_classes)).filter(Teacher.id == new_teacher.id)
-    result = await db.execute(query)
-    new_teacher = result.scalars().first()
-    
-    logger.info("Teacher created", employee_id=employee_id, name=teacher_data.name)
-    return teacher_to_response(new_teacher)
+    logger.info("Teacher created", employee_id=new_teacher.employee_id, name=teacher_data.name)
+    return teacher_row_to_response(new_teacher)
 
 
 @router.put("/{teacher_id}", response_model=TeacherResponse)
@@ -253,12 +330,21 @@ async def update_teacher(
     teacher_id: int,
     teacher_data: TeacherUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("edit_teachers"))
+    current_admin: Principal = Depends(require_permission("edit_teachers"))
 ):
     """Update a teacher"""
-    query = select(Teacher).options(selectinload(Teacher.assigned_classes)).filter(Teacher.id == teacher_id)
+    update_data = teacher_data.model_dump(exclude_unset=True)
+    if update_data:
+        query = (
+            update(Teacher)
+            .where(Teacher.id == teacher_id)
+            .values(**update_data)
+            .returning(*TEACHER_RETURNING)
+        )
+    else:
+        query = select(*TEACHER_RETURNING).where(Teacher.id == teacher_id)
     result = await db.execute(query)
-    teacher = result.scalars().first()
+    teacher = result.first()
     
     if not teacher:
         raise HTTPException(
@@ -266,26 +352,18 @@ async def update_teacher(
             detail="Teacher not found"
         )
     
-    update_data = teacher_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(teacher, field, value)
-    
     await db.commit()
-    
-    # Reload with relationship
-    query = select(Teacher).options(selectinload(Teacher.assigned_classes)).filter(Teacher.id == teacher_id)
-    result = await db.execute(query)
-    teacher = result.scalars().first()
+    typeahead.upsert("teacher", teacher.id, teacher.name, teacher.employee_id)
     
     logger.info("Teacher updated", employee_id=teacher.employee_id)
-    return teacher_to_response(teacher)
+    return teacher_row_to_response(teacher)
 
 
 @router.delete("/{teacher_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_teacher(
     teacher_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(require_permission("delete_teachers"))
+    current_admin: Principal = Depends(require_permission("delete_teachers"))
 ):
     """Delete a teacher"""
     result = await db.execute(select(Teacher).filter(Teacher.id == teacher_id))
@@ -299,6 +377,7 @@ async def delete_teacher(
     
     await db.delete(teacher)
     await db.commit()
+    typeahead.remove("teacher", teacher.id)
     
     logger.info("Teacher deleted", employee_id=teacher.employee_id)
     return None
@@ -0,0 +1,81 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Offset pagination makes the database scan and discard every earlier row, so
+deep pages get slower as a table grows. A cursor instead carries the sort key
+of the last row returned; the next page starts with a `WHERE (key) > (last)`
+seek on the index. Cursors are opaque to clients (base64url JSON) and are
+tied to the sort order they were issued for. Relevance order (searches)
+has no stable key to seek on and pages with offset only.
+
+The next cursor goes out in the X-Next-Cursor response header so the list
+endpoints keep returning a plain JSON array.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort: str, key: List[Any]) -> str:
+    payload = json.dumps({"s": sort, "k": key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, types: tuple) -> List[Any]:
+    """
+    Sort key stored in `cursor`, one value per entry of `types`.
+    400 if it is malformed or was issued for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["k"]
+        issued_for = payload["s"]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if issued_for != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor was issued for sort={issued_for}, not sort={sort}"
+        )
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(key, types))
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return key
+
+
+def resolve_sort(sort: Optional[str], search: Optional[str], after: Optional[str]) -> str:
+    """Requested sort, defaulting to relevance for searches and id otherwise"""
+    if sort is None:
+        sort = "relevance" if search else "id"
+    if sort == "relevance":
+        if not search:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="sort=relevance needs a search")
+        if after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursors are not available for sort=relevance; use offset"
+            )
+    return sort
+
+
+def reject_offset_with_cursor(after: Optional[str], offset: int):
+    if after is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either after (cursor) or offset, not both"
+        )
+
+
+def set_next_cursor(response: Response, rows: list, limit: int, sort: str, sort_key):
+    """Send a cursor after the last row when the page is full; `sort_key(row)` gives its key"""
+    if len(rows) == limit and sort != "relevance":
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, sort_key(rows[-1]))
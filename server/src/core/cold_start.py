@@ -0,0 +1,58 @@
+"""
+Cold start timing.
+
+The free-tier instance spins down when idle, so the first request after a
+wake-up pays for interpreter start, imports and startup. src.main imports
+this module first; it records when the app started importing, when startup
+finished and when the first response went out, and logs them once as
+`cold_start`. Exposed through the admin diagnostics endpoint.
+"""
+import time
+from typing import Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class ColdStart:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imported_ms: Optional[float] = None
+        self.ready_ms: Optional[float] = None
+        self.db_ready_ms: Optional[float] = None
+        self.first_response_ms: Optional[float] = None
+        self.first_response_path: Optional[str] = None
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def mark_imported(self):
+        self.imported_ms = self._elapsed_ms()
+
+    def mark_ready(self):
+        """Startup handlers finished - the server accepts connections from here on"""
+        self.ready_ms = self._elapsed_ms()
+        logger.info("startup_ready", import_ms=self.imported_ms, ready_ms=self.ready_ms)
+
+    def mark_db_ready(self):
+        self.db_ready_ms = self._elapsed_ms()
+
+    def mark_first_response(self, path: str):
+        if self.first_response_ms is not None:
+            return
+        self.first_response_ms = self._elapsed_ms()
+        self.first_response_path = path
+        logger.info("cold_start", **self.snapshot())
+
+    def snapshot(self) -> dict:
+        return {
+            "import_ms": self.imported_ms,
+            "ready_ms": self.ready_ms,
+            "db_ready_ms": self.db_ready_ms,
+            "first_response_ms": self.first_response_ms,
+            "first_response_path": self.first_response_path,
+        }
+
+
+cold_start = ColdStart()
@@ -0,0 +1,151 @@
+"""
+Rate limiting - one slowapi Limiter shared by every router.
+
+RATE_LIMIT_STORAGE selects the counter backend:
+- "memory":   per-process moving (sliding) window, exact but not shared
+- "database": fixed-window counters shared through the application database.
+              Hits are counted locally and flushed in batches by a background
+              task, so cross-worker totals may lag by one flush interval.
+"""
+import asyncio
+import time
+from typing import Dict, Tuple
+
+import structlog
+from limits.storage import Storage
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from src.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class DatabaseCounterStorage(Storage):
+    """
+    limits storage backend for the `schooldb://` scheme.
+
+    The storage API is synchronous (slowapi calls it inline), so it never
+    touches the database itself; flush() does, from the event loop.
+    """
+
+    STORAGE_SCHEME = ["schooldb"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options):
+        # key -> (global count at last flush, window expiry)
+        self._remote: Dict[str, Tuple[int, float]] = {}
+        # key -> (hits not yet flushed, window expiry)
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return ValueError
+
+    def _current(self, table: dict, key: str, now: float) -> Tuple[int, float]:
+        count, expiry = table.get(key, (0, 0.0))
+        if expiry <= now:
+            return 0, 0.0
+        return count, expiry
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        remote, remote_expiry = self._current(self._remote, key, now)
+        pending, pending_expiry = self._current(self._pending, key, now)
+        window_end = remote_expiry or pending_expiry or now + expiry
+        self._pending[key] = (pending + amount, window_end)
+        return remote + pending + amount
+
+    def get(self, key: str) -> int:
+        now = time.time()
+        return self._current(self._remote, key, now)[0] + self._current(self._pending, key, now)[0]
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        return (
+            self._current(self._remote, key, now)[1]
+            or self._current(self._pending, key, now)[1]
+            or now
+        )
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int | None:
+        cleared = len(self._remote) + len(self._pending)
+        self._remote.clear()
+        self._pending.clear()
+        return cleared
+
+    def clear(self, key: str) -> None:
+        self._remote.pop(key, None)
+        self._pending.pop(key, None)
+
+    async def flush(self):
+        """Upsert all pending hits in one statement and read back global totals"""
+        from sqlalchemy import case, delete
+        from src.db.session import engine
+        from src.db.models.rate_limit_counter import RateLimitCounter
+
+        now = time.time()
+        batch = {key: entry for key, entry in self._pending.items() if entry[1] > now}
+        self._pending = {}
+        # Drop remote snapshots of finished windows
+        self._remote = {key: entry for key, entry in self._remote.items() if entry[1] > now}
+        if not batch:
+            return
+
+        if engine.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(RateLimitCounter).values([
+            {"key": key, "count": count, "expires_at": expiry}
+            for key, (count, expiry) in batch.items()
+        ])
+        window_over = RateLimitCounter.expires_at <= now
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RateLimitCounter.key],
+            set_={
+                "count": case((window_over, stmt.excluded.count), else_=RateLimitCounter.count + stmt.excluded.count),
+                "expires_at": case((window_over, stmt.excluded.expires_at), else_=RateLimitCounter.expires_at),
+            }
+        ).returning(RateLimitCounter.key, RateLimitCounter.count, RateLimitCounter.expires_at)
+
+        try:
+            async with engine.begin() as conn:
+                rows = (await conn.execute(stmt)).all()
+                # Opportunistic cleanup of finished windows
+                await conn.execute(delete(RateLimitCounter).where(RateLimitCounter.expires_at < now - 60))
+        except Exception:
+            # Put the hits back so they are retried on the next flush
+            for key, (count, expiry) in batch.items():
+                pending, _ = self._pending.get(key, (0, expiry))
+                self._pending[key] = (pending + count, expiry)
+            raise
+
+        for key, count, expiry in rows:
+            self._remote[key] = (count, expiry)
+
+
+def _build_limiter() -> Limiter:
+    if settings.RATE_LIMIT_STORAGE == "database":
+        return Limiter(key_func=get_remote_address, storage_uri="schooldb://", strategy="fixed-window")
+    return Limiter(key_func=get_remote_address, storage_uri="memory://", strategy="moving-window")
+
+
+limiter = _build_limiter()
+
+
+async def rate_limit_flush_loop():
+    """Background task: flush shared rate limit counters (database storage only)"""
+    storage = limiter._storage
+    if not isinstance(storage, DatabaseCounterStorage):
+        return
+    while True:
+        try:
+            await storage.flush()
+        except Exception as e:
+            logger.warning(f"Rate limit flush failed: {e}")
+        await asyncio.sleep(settings.RATE_LIMIT_FLUSH_INTERVAL_SECONDS)
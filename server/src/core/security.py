@@ -1,21 +1,133 @@
+import asyncio
+import hashlib
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 from jose import jwt
 from passlib.context import CryptContext
 from src.core.config import settings
+from src.core.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
-def create_access_token(subject: str | Any, extra_claims: dict[str, Any] = None) -> str:
+def create_access_token(
+    subject: str | Any,
+    extra_claims: dict[str, Any] = None,
+    permissions: list[str] | None = None,
+    token_version: int | None = None
+) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"exp": expire, "sub": str(subject)}
     if extra_claims:
         to_encode.update(extra_claims)
+    # Claims mode: embed authorization data so require_permission can skip the DB
+    if settings.AUTH_CLAIMS_MODE and token_version is not None:
+        to_encode["permissions"] = list(permissions or [])
+        to_encode["ver"] = token_version
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# ==================== VERIFIED TOKEN CACHE ====================
+# The admin SPA sends the same bearer token on every request; memoize the
+# verified claims by token digest until the token's own `exp`.
+token_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims (raises JWTError when invalid).
+    
+    Performance: O(1) digest lookup on a hit; signature check only on a miss.
+    Callers must not mutate the returned dict - it is shared via the cache.
+    """
+    if settings.JWT_CACHE_SIZE <= 0:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        exp = payload.get("exp")
+        if exp is not None:
+            token_cache.set(digest, payload, ttl=exp - time.time())
+    return payload
+
+
+def create_refresh_token() -> tuple[str, str]:
+    """
+    Return (token, token_hash). Only the hash is stored; the token is random
+    enough that a fast sha256 lookup is safe - no password hashing needed.
+    """
+    token = secrets.token_urlsafe(48)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with different argon2 costs than configured"""
+    return pwd_context.needs_update(hashed_password)
+
+
+# ==================== PASSWORD WORKER POOL ====================
+# argon2 is CPU-bound and takes tens of milliseconds; running it inline blocks
+# the event loop for every other request. argon2-cffi releases the GIL while
+# hashing, so a small thread pool gives real parallelism without forking.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_jobs_in_flight = 0
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password worker pool and its queue are full"""
+    pass
+
+
+async def _run_password_job(func, *args):
+    """Run a password job in the pool, rejecting fast when saturated"""
+    global _password_jobs_in_flight
+    capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+    if _password_jobs_in_flight >= capacity:
+        raise PasswordHashingBusy()
+    
+    _password_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_jobs_in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_job(get_password_hash, password)
+
+
+def password_pool_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "queue_limit": settings.PASSWORD_HASH_QUEUE_LIMIT,
+        "in_flight": _password_jobs_in_flight,
+    }
@@ -0,0 +1,105 @@
+"""
+Streaming readers for uploaded CSV and XLSX files.
+
+Rows come out one at a time as dicts keyed by normalized header names
+("Father Name" -> "father_name"), so an import holds at most one batch in
+memory no matter how large the file is. Uploads are spooled to disk by
+Starlette; the readers pull from that file and are meant to be driven from
+a worker thread (they block on file I/O).
+
+XLSX support needs the optional `xlsx` extra (openpyxl).
+"""
+import codecs
+import csv
+import shutil
+import tempfile
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CSV_TYPES = {"text/csv", "application/csv", "application/vnd.ms-excel"}
+XLSX_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class TabularFileError(ValueError):
+    """Unsupported or unreadable upload"""
+
+
+def normalize_header(name: Any) -> str:
+    return "_".join(str(name or "").strip().lower().replace("-", " ").split())
+
+
+def _cell(value: Any) -> Optional[Any]:
+    """Spreadsheet cell -> None, str or date (numbers become text; fields parse them)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _csv_rows(file) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    # Decoded line by line: TextIOWrapper needs readable(), which
+    # SpooledTemporaryFile only has from Python 3.11
+    reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+    header = [normalize_header(name) for name in next(reader, [])]
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        # line_num is the last physical line read, i.e. the row as shown in an editor
+        yield reader.line_num, {key: _cell(value) for key, value in zip(header, values) if key}
+
+
+def _xlsx_rows(file) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise TabularFileError("XLSX import needs openpyxl (install the xlsx extra); upload CSV instead")
+
+    # A zip archive needs random access; copy the spooled upload to a real
+    # temporary file in chunks (SpooledTemporaryFile is not seekable() on 3.10)
+    archive = tempfile.TemporaryFile()
+    shutil.copyfileobj(file, archive)
+    archive.seek(0)
+    # read_only streams rows from the archive instead of loading the sheet
+    workbook = load_workbook(archive, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [normalize_header(name) for name in next(rows, ())]
+        for number, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield number, {key: _cell(value) for key, value in zip(header, values) if key}
+    finally:
+        workbook.close()
+        archive.close()
+
+
+def iter_rows(file, filename: str, content_type: Optional[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """(row number, row dict) for each non-empty data row of an uploaded CSV or XLSX file"""
+    name = (filename or "").lower()
+    if name.endswith(".xlsx") or content_type == XLSX_TYPE:
+        return _xlsx_rows(file)
+    if name.endswith(".csv") or content_type in CSV_TYPES:
+        return _csv_rows(file)
+    raise TabularFileError("Upload a .csv or .xlsx file")
+
+
+def read_batch(rows: Iterator, size: int) -> List:
+    """Next `size` items of `rows` (fewer at the end); parse failures raise TabularFileError"""
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                break
+    except TabularFileError:
+        raise
+    except Exception as e:
+        # Bad encoding, broken CSV quoting, not a zip archive, ...
+        raise TabularFileError(f"Could not read file: {e}")
+    return batch
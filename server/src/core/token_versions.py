@@ -0,0 +1,91 @@
+"""
+In-memory admin token version table.
+
+Tokens issued in claims mode carry a `ver` claim. A token is only trusted
+without a database round trip while its version matches the version known
+here; the table is refreshed from the admins table in the background and
+bumped locally right after writes in this process.
+
+Every admin change bumps token_version, so the table also tells each worker
+when its cached principal (src.api.v1.deps) is out of date - including
+changes made by other workers, within TOKEN_VERSION_REFRESH_SECONDS.
+"""
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import structlog
+
+from src.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class TokenVersionTable:
+    def __init__(self):
+        # admin pk -> (token_version, is_active)
+        self._versions: Dict[int, Tuple[int, bool]] = {}
+        self._revoked: set[int] = set()
+        self.loaded = False
+
+    def replace(self, rows):
+        """Swap in a fresh snapshot of (id, token_version, is_active) rows"""
+        versions = {row[0]: (row[1] or 0, bool(row[2])) for row in rows}
+        # Admins gone since the last snapshot were deleted by another worker
+        deleted = self._versions.keys() - versions.keys()
+        self._versions = versions
+        self._revoked = {pk for pk in self._revoked | deleted if pk not in versions}
+        self.loaded = True
+
+    def bump(self, admin_pk: int, token_version: int, is_active: bool):
+        """Record a local write so this worker rejects stale tokens immediately"""
+        self._versions[admin_pk] = (token_version or 0, bool(is_active))
+        self._revoked.discard(admin_pk)
+
+    def revoke(self, admin_pk: int):
+        """Mark a deleted admin; all of its tokens are rejected"""
+        self._versions.pop(admin_pk, None)
+        self._revoked.add(admin_pk)
+
+    def check(self, admin_pk: int, token_version: int) -> Optional[bool]:
+        """
+        True if the claims can be trusted, False if the token is stale,
+        None if this admin is unknown (caller falls back to the database).
+        """
+        if admin_pk in self._revoked:
+            return False
+        entry = self._versions.get(admin_pk)
+        if entry is None:
+            return None
+        version, is_active = entry
+        return is_active and version == token_version
+
+    def is_newer(self, admin_pk: int, token_version: int) -> bool:
+        """True if the admin changed (or was deleted) since `token_version` was read"""
+        if admin_pk in self._revoked:
+            return True
+        entry = self._versions.get(admin_pk)
+        return entry is not None and entry[0] > token_version
+
+
+token_versions = TokenVersionTable()
+
+
+async def refresh_token_versions():
+    """Reload the version table from the admins table (single small query)"""
+    from sqlalchemy import select
+    from src.db.session import AsyncSessionLocal
+    from src.db.models.admin import Admin
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Admin.id, Admin.token_version, Admin.is_active))
+        token_versions.replace(result.all())
+
+
+async def token_version_refresh_loop():
+    """Background task: keep the version table in sync across workers"""
+    while True:
+        try:
+            await refresh_token_versions()
+        except Exception as e:
+            logger.warning(f"Token version refresh failed: {e}")
+        await asyncio.sleep(settings.TOKEN_VERSION_REFRESH_SECONDS)
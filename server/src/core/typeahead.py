@@ -0,0 +1,225 @@
+"""
+In-memory typeahead index for the admin quick-search.
+
+Holds the searchable labels of every student (name, student_id), teacher
+(name, employee_id) and class (class_name) in process memory, keyed by
+trigram, plus word prefixes for one- and two-character queries. A
+suggestion is a few set intersections and a substring check, with no
+database round trip.
+
+Names and codes are indexed as separate fields, so a query never matches
+across the end of a name and the start of its code.
+
+The index is loaded in the background at startup and reloaded every
+TYPEAHEAD_REFRESH_SECONDS so other workers' writes show up. Write handlers
+in this process call upsert()/remove() so their own changes are visible
+immediately; calls made while a reload is running are journaled and
+replayed onto the new index before it is swapped in.
+"""
+import asyncio
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import structlog
+
+from src.core.config import settings
+
+logger = structlog.get_logger()
+
+GRAM_SIZE = 3
+
+EntryKey = Tuple[str, int]  # (kind, primary key)
+
+
+class Entry(NamedTuple):
+    kind: str  # "student" | "teacher" | "class"
+    id: int
+    label: str
+    code: Optional[str]  # student_id / employee_id; None for classes
+    label_key: str  # Normalized (lowercased) label and code, matched against
+    code_key: str
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return (self.label_key, self.code_key) if self.code_key else (self.label_key,)
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def _prefixes(text: str) -> Set[str]:
+    """First one and two characters of every word (short queries)"""
+    prefixes = set()
+    for word in text.split():
+        prefixes.update(word[:length] for length in range(1, GRAM_SIZE) if len(word) >= length)
+    return prefixes
+
+
+def _entry_tokens(entry: Entry) -> Tuple[Set[str], Set[str]]:
+    """(grams, prefixes) of each field on its own"""
+    grams, prefixes = set(), set()
+    for field in entry.fields:
+        grams |= _grams(field)
+        prefixes |= _prefixes(field)
+    return grams, prefixes
+
+
+def _entry(kind: str, id: int, label: str, code: Optional[str]) -> Entry:
+    return Entry(kind, id, label, code, _normalize(label), _normalize(code))
+
+
+class TypeaheadIndex:
+    def __init__(self):
+        self._entries: Dict[EntryKey, Entry] = {}
+        self._grams: Dict[str, Set[EntryKey]] = {}
+        self._prefixes: Dict[str, Set[EntryKey]] = {}
+        # Local upsert/remove calls made while a reload runs (see begin_refresh)
+        self._journal: Optional[List[Tuple[str, tuple]]] = None
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, entry: Entry):
+        key = (entry.kind, entry.id)
+        self._entries[key] = entry
+        grams, prefixes = _entry_tokens(entry)
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(key)
+        for prefix in prefixes:
+            self._prefixes.setdefault(prefix, set()).add(key)
+
+    def _discard(self, key: EntryKey):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        grams, prefixes = _entry_tokens(entry)
+        for postings, tokens in ((self._grams, grams), (self._prefixes, prefixes)):
+            for token in tokens:
+                keys = postings.get(token)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del postings[token]
+
+    def upsert(self, kind: str, id: int, label: str, code: Optional[str] = None):
+        """Add or replace one entry after a local write"""
+        if self._journal is not None:
+            self._journal.append(("upsert", (kind, id, label, code)))
+        self._discard((kind, id))
+        self._add(_entry(kind, id, label, code))
+
+    def remove(self, kind: str, id: int):
+        if self._journal is not None:
+            self._journal.append(("remove", (kind, id)))
+        self._discard((kind, id))
+
+    def begin_refresh(self):
+        """
+        Start journaling local writes; call before reading the reload's
+        snapshot. A write that lands in the snapshot too is replayed
+        harmlessly, since upsert and remove are idempotent.
+        """
+        self._journal = []
+
+    def end_refresh(self):
+        self._journal = None
+
+    @classmethod
+    def build(cls, rows) -> "TypeaheadIndex":
+        """New index from (kind, id, label, code) rows"""
+        index = cls()
+        for kind, id, label, code in rows:
+            index._add(_entry(kind, id, label, code))
+        return index
+
+    def replace(self, fresh: "TypeaheadIndex"):
+        """Swap in a freshly built index, after replaying the writes journaled since begin_refresh"""
+        for operation, args in self._journal or ():
+            getattr(fresh, operation)(*args)
+        self._entries, self._grams, self._prefixes = fresh._entries, fresh._grams, fresh._prefixes
+        self.end_refresh()
+        self.loaded = True
+
+    def suggest(self, query: str, limit: int = 10, kinds: Optional[Set[str]] = None) -> List[Entry]:
+        """Best `limit` entries containing `query`: exact, then prefix, then word prefix, then substring"""
+        needle = _normalize(query)
+        if not needle:
+            return []
+        if len(needle) < GRAM_SIZE:
+            candidates = self._prefixes.get(needle, set())
+        else:
+            postings = [self._grams.get(gram) for gram in _grams(needle)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+
+        scored = []
+        for key in candidates:
+            entry = self._entries[key]
+            if kinds is not None and entry.kind not in kinds:
+                continue
+            label, code = entry.label_key, entry.code_key
+            if needle == label or needle == code:
+                rank = 0
+            elif label.startswith(needle) or code.startswith(needle):
+                rank = 1
+            elif f" {needle}" in f" {label}":
+                rank = 2
+            elif needle in label or needle in code:
+                rank = 3
+            else:
+                # Every trigram occurs, but not as one contiguous run in one field
+                continue
+            scored.append((rank, len(entry.label), entry.label, key))
+        return [self._entries[item[3]] for item in heapq.nsmallest(limit, scored)]
+
+
+typeahead = TypeaheadIndex()
+
+
+async def refresh_typeahead():
+    """Reload the index from the students, teachers and classes tables"""
+    from sqlalchemy import literal, null, select, union_all
+    from src.db.session import AsyncSessionLocal
+    from src.db.models.student import Student
+    from src.db.models.teacher import Teacher
+    from src.db.models.school_class import SchoolClass
+
+    query = union_all(
+        select(literal("student"), Student.id, Student.name, Student.student_id),
+        select(literal("teacher"), Teacher.id, Teacher.name, Teacher.employee_id),
+        select(literal("class"), SchoolClass.id, SchoolClass.class_name, null()),
+    )
+    # Writes from here on may be missing from the snapshot; they are replayed
+    typeahead.begin_refresh()
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(query)
+            rows = result.all()
+        # Building a large index takes seconds of CPU; keep it off the event loop
+        fresh = await asyncio.to_thread(TypeaheadIndex.build, rows)
+    except BaseException:
+        typeahead.end_refresh()
+        raise
+    typeahead.replace(fresh)
+
+
+async def typeahead_refresh_loop():
+    """Background task: build the index at startup, then keep it in sync across workers"""
+    interval = settings.TYPEAHEAD_REFRESH_SECONDS
+    while True:
+        try:
+            await refresh_typeahead()
+            logger.debug("typeahead_refreshed", entries=len(typeahead))
+        except Exception as e:
+            logger.warning(f"Typeahead refresh failed: {e}")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
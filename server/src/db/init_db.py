@@ -3,9 +3,10 @@ from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from src.db.base import Base # Import base to register models
 from src.db.session import engine
-from src.db.models.admin import Admin
+from src.db.migrations import run_migrations
+from src.db.public_ids import sync_public_id_sequences
+from src.db.models.admin import Admin, admin_permission_mask
 from src.db.models.student import Student
 from src.db.models.teacher import Teacher
 from src.db.models.school_class import SchoolClass
@@ -16,36 +17,27 @@ logger = structlog.get_logger()
 async def init_db():
     """
     Initialize database:
-    1. Create tables.
+    1. Apply schema migrations.
     2. Create default Principal/Admin if not exists.
     3. Seed students, teachers, classes.
     """
     logger.info("Initializing database...")
     
-    # 1. Create Tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    logger.info("Tables checked/created.")
-
-    # 1.5. Manual Migration (Add admin columns if missing)
-    async with engine.begin() as conn:
-        try:
-            from sqlalchemy import text
-            await conn.execute(text("ALTER TABLE admins ADD COLUMN IF NOT EXISTS admin_id VARCHAR;"))
-            await conn.execute(text("ALTER TABLE admins ADD COLUMN IF NOT EXISTS full_name VARCHAR;"))
-            await conn.execute(text("ALTER TABLE admins ADD COLUMN IF NOT EXISTS profile_image VARCHAR;"))
-            logger.info("Schema updated: admin columns checked.")
-        except Exception as e:
-            logger.warning(f"Schema update minor issue: {e}")
+    # 1. Create/upgrade tables (versioned migrations)
+    applied = await run_migrations(engine)
+    logger.info("Schema migrated.", applied=applied)
 
     # 2. Seed Data
     from src.db.session import AsyncSessionLocal
     async with AsyncSessionLocal() as db:
         await create_initial_user(db)
+        await sync_permission_masks(db)
         await seed_teachers(db)
         await seed_classes(db)
         await seed_students(db)
+    # Seed rows carry explicit public IDs; move the ID sequences past them
+    async with engine.begin() as conn:
+        await sync_public_id_sequences(conn)
     
     logger.info("Database initialization complete.")
 
@@ -78,6 +70,19 @@ async def create_initial_user(db: AsyncSession):
             await db.commit()
             logger.info("Updated existing admin with missing fields.")
 
+async def sync_permission_masks(db: AsyncSession):
+    """Backfill Admin.permission_mask from the permissions list where it drifted"""
+    result = await db.execute(select(Admin))
+    updated = 0
+    for admin in result.scalars().all():
+        mask = admin_permission_mask(admin.role, admin.permissions)
+        if admin.permission_mask != mask:
+            admin.permission_mask = mask
+            updated += 1
+    if updated:
+        await db.commit()
+        logger.info(f"Permission masks synced for {updated} admins.")
+
 async def seed_teachers(db: AsyncSession):
     result = await db.execute(select(Teacher).limit(1))
     if result.scalars().first():
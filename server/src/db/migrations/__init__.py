@@ -0,0 +1,81 @@
+"""
+Versioned schema migrations.
+
+Each migration module defines VERSION, DESCRIPTION and `async def
+upgrade(engine)`, and opens its own transactions - that lets online steps
+(CREATE INDEX CONCURRENTLY, batched backfills) run outside one long
+transaction. Migrations must be idempotent: a version is recorded in
+schema_version only after upgrade() returns, so a crash reruns it.
+
+Apply with:
+    uv run python -m scripts.migrate
+Startup only compares the recorded version with LATEST_VERSION.
+"""
+import structlog
+from sqlalchemy import func, select, text
+
+from src.db.migrations import (
+    v0001_baseline,
+    v0002_admin_columns,
+    v0003_composite_indexes,
+    v0004_backfill_admin_auth,
+    v0005_search_indexes,
+    v0006_public_id_sequences,
+)
+from src.db.models.schema_version import SchemaVersion
+
+logger = structlog.get_logger()
+
+MIGRATIONS = [
+    v0001_baseline,
+    v0002_admin_columns,
+    v0003_composite_indexes,
+    v0004_backfill_admin_auth,
+    v0005_search_indexes,
+    v0006_public_id_sequences,
+]
+LATEST_VERSION = MIGRATIONS[-1].VERSION
+
+# Arbitrary key for the Postgres advisory lock that serializes runners
+MIGRATION_LOCK_KEY = 715_021_018
+
+
+async def current_version(engine) -> int:
+    """Highest applied migration, 0 for a database without schema_version"""
+    async with engine.connect() as conn:
+        has_table = await conn.run_sync(
+            lambda sync_conn: sync_conn.dialect.has_table(sync_conn, SchemaVersion.__tablename__)
+        )
+        if not has_table:
+            return 0
+        result = await conn.execute(select(func.max(SchemaVersion.version)))
+        return result.scalar() or 0
+
+
+async def run_migrations(engine, target: int = None) -> list[int]:
+    """Apply pending migrations up to `target` (default: latest); returns applied versions"""
+    target = LATEST_VERSION if target is None else target
+    async with engine.connect() as lock_conn:
+        if engine.dialect.name == "postgresql":
+            # Transaction-scoped so it also holds behind a transaction-mode pooler
+            await lock_conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+        async with engine.begin() as conn:
+            await conn.run_sync(SchemaVersion.__table__.create, checkfirst=True)
+        version = await current_version(engine)
+
+        applied = []
+        for migration in MIGRATIONS:
+            if migration.VERSION <= version or migration.VERSION > target:
+                continue
+            logger.info("migration_start", version=migration.VERSION, description=migration.DESCRIPTION)
+            await migration.upgrade(engine)
+            async with engine.begin() as conn:
+                await conn.execute(SchemaVersion.__table__.insert().values(
+                    version=migration.VERSION, description=migration.DESCRIPTION
+                ))
+            applied.append(migration.VERSION)
+            logger.info("migration_done", version=migration.VERSION)
+
+        await lock_conn.rollback()
+    return applied
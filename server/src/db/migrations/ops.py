@@ -0,0 +1,60 @@
+"""
+Online, lock-light schema operations for migrations.
+
+Postgres builds indexes with CREATE INDEX CONCURRENTLY (no write lock, but
+not allowed inside a transaction), and backfills run in small keyset
+batches, each in its own short transaction, with a pause between batches so
+live traffic keeps its connections and row locks stay brief.
+"""
+import asyncio
+
+import structlog
+from sqlalchemy import text
+
+from src.core.config import settings
+
+logger = structlog.get_logger()
+
+
+async def create_index_concurrently(engine, name: str, table: str, columns: list[str], using: str = None):
+    """
+    Create an index without blocking writes (plain CREATE INDEX on SQLite).
+    `using` picks a Postgres access method, e.g. "gin" with "name gin_trgm_ops" columns.
+    """
+    definition = f"({', '.join(columns)})"
+    if using is not None:
+        definition = f"USING {using} {definition}"
+    if engine.dialect.name != "postgresql":
+        async with engine.begin() as conn:
+            await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}"))
+        return
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        # A failed concurrent build leaves an INVALID index behind; drop it and retry
+        invalid = await conn.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name})
+        if invalid.first():
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        await conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}"))
+    logger.info("migration_index_ready", index=name)
+
+
+async def backfill_in_batches(engine, process_batch, batch_size: int = None, pause_seconds: float = None) -> int:
+    """
+    Run process_batch(conn, after_id, batch_size) -> (rows_updated, last_id)
+    until it returns last_id None. Each batch commits on its own.
+    """
+    batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+    pause_seconds = settings.MIGRATION_BATCH_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    after_id = 0
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            updated, after_id = await process_batch(conn, after_id, batch_size)
+        total += updated
+        if after_id is None:
+            return total
+        await asyncio.sleep(pause_seconds)  # Throttle: leave room for live traffic
@@ -0,0 +1,18 @@
+"""
+Baseline: every table the app uses, replacing the old migrate_applications,
+migrate_contacts, migrate_exams and migrate_site_pages scripts.
+Existing tables are left as they are.
+"""
+from src.db.base import Base
+from src.db.models import (  # noqa: F401 - register tables
+    admin, application, contact_request, exam, public_id_counter, rate_limit_counter,
+    refresh_token, schema_version, school_class, site_page_content, student, teacher
+)
+
+VERSION = 1
+DESCRIPTION = "baseline tables"
+
+
+async def upgrade(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,24 @@
+"""
+Admin columns added after the first deployments (previously ALTERed by
+init_db on every start). The baseline already creates them on new databases.
+"""
+from sqlalchemy import text
+
+VERSION = 2
+DESCRIPTION = "admin profile, token_version and permission_mask columns"
+
+COLUMNS = [
+    "admin_id VARCHAR",
+    "full_name VARCHAR",
+    "profile_image VARCHAR",
+    "token_version INTEGER DEFAULT 0",
+    "permission_mask BIGINT DEFAULT 0",
+]
+
+
+async def upgrade(engine):
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as conn:
+        for column in COLUMNS:
+            await conn.execute(text(f"ALTER TABLE admins ADD COLUMN IF NOT EXISTS {column}"))
@@ -0,0 +1,21 @@
+"""
+Composite indexes declared on the models. Tables created by the old
+migrate_* scripts predate them; build them without blocking writes.
+"""
+from src.db.migrations.ops import create_index_concurrently
+
+VERSION = 3
+DESCRIPTION = "composite indexes for list/filter queries"
+
+INDEXES = [
+    ("ix_student_class_active", "students", ["class_id", "is_active"]),
+    ("ix_student_active_name", "students", ["is_active", "name"]),
+    ("ix_teacher_dept_active", "teachers", ["department", "is_active"]),
+    ("ix_teacher_active_name", "teachers", ["is_active", "name"]),
+    ("ix_page_active_order", "site_pages_content", ["page_slug", "is_active", "order_index"]),
+]
+
+
+async def upgrade(engine):
+    for name, table, columns in INDEXES:
+        await create_index_concurrently(engine, name, table, columns)
@@ -0,0 +1,40 @@
+"""
+Backfill admins.permission_mask and token_version for rows written before
+those columns existed, in throttled batches.
+"""
+from sqlalchemy import bindparam, select, update
+
+from src.db.migrations.ops import backfill_in_batches
+from src.db.models.admin import Admin, admin_permission_mask
+
+VERSION = 4
+DESCRIPTION = "backfill admin permission masks and token versions"
+
+
+async def _backfill_batch(conn, after_id: int, batch_size: int):
+    rows = (await conn.execute(
+        select(Admin.id, Admin.role, Admin.permissions, Admin.permission_mask, Admin.token_version)
+        .where(Admin.id > after_id)
+        .order_by(Admin.id)
+        .limit(batch_size)
+    )).all()
+    changes = []
+    for row in rows:
+        mask = admin_permission_mask(row.role, row.permissions)
+        if row.permission_mask != mask or row.token_version is None:
+            changes.append({"row_id": row.id, "mask": mask, "version": row.token_version or 0})
+    if changes:
+        # One executemany statement for the whole batch
+        admins = Admin.__table__
+        await conn.execute(
+            update(admins)
+            .where(admins.c.id == bindparam("row_id"))
+            .values(permission_mask=bindparam("mask"), token_version=bindparam("version")),
+            changes,
+        )
+    last_id = rows[-1].id if len(rows) == batch_size else None
+    return len(changes), last_id
+
+
+async def upgrade(engine):
+    await backfill_in_batches(engine, _backfill_batch)
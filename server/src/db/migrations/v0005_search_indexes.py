@@ -0,0 +1,56 @@
+"""
+Substring search indexes for the student and teacher lists (see src.db.search).
+
+Postgres: pg_trgm GIN indexes on the name and public ID columns, which
+serve `ILIKE '%term%'` and similarity() ranking without a sequential scan.
+SQLite: external-content FTS5 tables with the trigram tokenizer, kept in
+sync with their base table by triggers and filled once with 'rebuild'.
+"""
+from sqlalchemy import text
+
+from src.db.migrations.ops import create_index_concurrently
+
+VERSION = 5
+DESCRIPTION = "trigram search indexes on student and teacher name/ID"
+
+# (base table, public ID column, FTS5 table on SQLite)
+SEARCH_TABLES = [
+    ("students", "student_id", "students_search"),
+    ("teachers", "employee_id", "teachers_search"),
+]
+
+
+def _sqlite_statements(table: str, id_column: str, fts: str) -> list[str]:
+    columns = f"name, {id_column}"
+    new_values = f"new.id, new.name, new.{id_column}"
+    old_values = f"'delete', old.id, old.name, old.{id_column}"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES ({new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ({old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ({old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES ({new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+async def upgrade(engine):
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as conn:
+            for table, id_column, fts in SEARCH_TABLES:
+                for statement in _sqlite_statements(table, id_column, fts):
+                    await conn.execute(text(statement))
+        return
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table, id_column, _ in SEARCH_TABLES:
+        singular = table.rstrip("s")
+        for column in ("name", id_column):
+            await create_index_concurrently(
+                engine, f"ix_{singular}_{column}_trgm", table, [f"{column} gin_trgm_ops"], using="gin"
+            )
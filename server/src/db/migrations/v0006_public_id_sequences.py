@@ -0,0 +1,16 @@
+"""
+Public ID sequences (Postgres) and counter rows (SQLite), created up front.
+
+Allocation draws numbers inside the request's transaction (see
+src.db.public_ids); creating the sequence there would be undone by any
+rollback of that transaction.
+"""
+from src.db.public_ids import sync_public_id_sequences
+
+VERSION = 6
+DESCRIPTION = "public ID sequences for students, teachers and admins"
+
+
+async def upgrade(engine):
+    async with engine.begin() as conn:
+        await sync_public_id_sequences(conn)
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime
 from sqlalchemy.sql import func
 from src.db.base import Base
+from src.db.types import PortableJSON
 
 class Admin(Base):
     __tablename__ = "admins"
@@ -13,8 +13,10 @@ class Admin(Base):
     role = Column(String, default="ADMIN") # e.g., PRINCIPAL, ADMIN
     full_name = Column(String, nullable=True)
     profile_image = Column(String, nullable=True)
-    permissions = Column(JSONB, default=["view_dashboard"])  # Array of permissions
+    permissions = Column(PortableJSON, default=["view_dashboard"])  # Array of permissions
+    permission_mask = Column(BigInteger, default=0)  # Bitset of permissions (see PERMISSION_BITS)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, default=0)  # Bumped on admin changes to revoke issued tokens
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 # Available permissions - Granular
@@ -50,6 +52,30 @@ AVAILABLE_PERMISSIONS = [
     "manage_settings",
 ]
 
+# Stable bit index compiled from AVAILABLE_PERMISSIONS.
+# Append new permissions at the end only - reordering changes stored masks.
+PERMISSION_BITS = {name: 1 << index for index, name in enumerate(AVAILABLE_PERMISSIONS)}
+ALL_PERMISSIONS_MASK = (1 << len(AVAILABLE_PERMISSIONS)) - 1
+
+
+def permissions_to_mask(permissions) -> int:
+    """Compile a permission list into its bitmask (unknown names are ignored)"""
+    if not permissions:
+        return 0
+    if "all" in permissions:
+        return ALL_PERMISSIONS_MASK
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS.get(permission, 0)
+    return mask
+
+
+def admin_permission_mask(role: str, permissions) -> int:
+    """Mask stored alongside Admin.permissions - PRINCIPAL gets every bit"""
+    if role == "PRINCIPAL":
+        return ALL_PERMISSIONS_MASK
+    return permissions_to_mask(permissions)
+
 # Role Templates
 ROLE_TEMPLATES = {
     "FULL_ACCESS": {
@@ -91,3 +117,9 @@ ROLE_TEMPLATES = {
 
 # Principal has all permissions (auto-assigned, not selectable)
 PRINCIPAL_PERMISSIONS = ["all"]
+
+# Template masks exposed by /admins/permissions
+ROLE_TEMPLATE_MASKS = {
+    key: permissions_to_mask(template["permissions"])
+    for key, template in ROLE_TEMPLATES.items()
+}
@@ -0,0 +1,12 @@
+"""
+PublicIdCounter Database Model - public ID counters where sequences are unavailable (SQLite)
+"""
+from sqlalchemy import Column, Integer, String
+from src.db.base import Base
+
+
+class PublicIdCounter(Base):
+    __tablename__ = "public_id_counters"
+
+    name = Column(String(64), primary_key=True)  # e.g. student_public_id_seq
+    value = Column(Integer, nullable=False, default=0)  # Last number handed out
@@ -0,0 +1,13 @@
+"""
+RateLimitCounter Database Model - shared fixed-window counters for slowapi
+"""
+from sqlalchemy import Column, Integer, String, Float
+from src.db.base import Base
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    key = Column(String(255), primary_key=True)  # limits key, e.g. LIMITER/127.0.0.1/login/5/1/minute
+    count = Column(Integer, nullable=False, default=0)
+    expires_at = Column(Float, nullable=False, index=True)  # Unix timestamp of window end
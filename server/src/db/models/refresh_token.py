@@ -0,0 +1,18 @@
+"""
+RefreshToken Database Model - rotating refresh tokens, stored hashed
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from src.db.base import Base
+from src.db.types import UTCDateTime
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    admin_id = Column(Integer, ForeignKey("admins.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)  # sha256 hex of the token
+    expires_at = Column(UTCDateTime, nullable=False, index=True)  # Index for the reaper
+    revoked_at = Column(UTCDateTime, nullable=True)  # Set on rotation/logout
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
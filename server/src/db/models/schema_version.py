@@ -0,0 +1,14 @@
+"""
+SchemaVersion Database Model - one row per applied migration (see src/db/migrations)
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from src.db.base import Base
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String(200), nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
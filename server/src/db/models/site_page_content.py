@@ -22,6 +22,8 @@ class SitePageContent(Base):
     __table_args__ = (
         Index('ix_page_active_order', 'page_slug', 'is_active', 'order_index'),
     )
+    # Fetch created_at/updated_at via RETURNING on insert/update - no refresh query
+    __mapper_args__ = {"eager_defaults": True}
     
     def __repr__(self):
         return f"<SitePageContent {self.page_slug}/{self.section_key}>"
@@ -0,0 +1,86 @@
+"""
+Background connection health management.
+
+Replaces the per-checkout pre-ping (one extra cross-region round trip on
+every request) with a scheduled sweep over the idle connections in the pool.
+Connections that fail the probe are invalidated so the next checkout opens
+a fresh one. Statements that still land on a dead connection are retried
+once by the session (see RetryingAsyncSession in src.db.session).
+"""
+import asyncio
+
+import structlog
+from sqlalchemy.exc import DBAPIError
+
+from src.core.config import settings
+from src.db.pool_metrics import pool_metrics_for
+
+logger = structlog.get_logger()
+
+
+async def check_idle_connections(engine) -> dict:
+    """
+    Probe every connection currently idle in the pool.
+
+    The queue pool hands out connections FIFO, so checking out and returning
+    one connection `checkedin()` times visits each idle connection once.
+    A disconnect invalidates that connection; SQLAlchemy reconnects it on
+    its next checkout.
+    """
+    pool = engine.pool
+    idle = pool.checkedin() if hasattr(pool, "checkedin") else 0
+    checked = evicted = 0
+    for _ in range(idle):
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+            checked += 1
+        except DBAPIError as e:
+            if not e.connection_invalidated:
+                raise
+            evicted += 1
+
+    pool_metrics = pool_metrics_for(engine)
+    pool_metrics.health_checks += checked + evicted
+    pool_metrics.health_evictions += evicted
+    return {"checked": checked, "evicted": evicted}
+
+
+async def prefill_pool(engine, size: int) -> int:
+    """
+    Open `size` connections concurrently and return them to the pool.
+
+    All connections are held until every one is open, so the pool ends up
+    with `size` distinct idle connections instead of reusing the first.
+    Returns how many opened.
+    """
+
+    async def _open():
+        conn = await engine.connect()
+        await conn.exec_driver_sql("SELECT 1")
+        return conn
+
+    results = await asyncio.gather(*(_open() for _ in range(size)), return_exceptions=True)
+    opened = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"Pool prefill connection failed: {result}")
+            continue
+        await result.close()
+        opened += 1
+    return opened
+
+
+async def pool_health_loop(engine):
+    """Background task: validate idle pool connections on a schedule"""
+    interval = settings.DB_POOL_HEALTH_CHECK_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await check_idle_connections(engine)
+            if result["evicted"]:
+                logger.warning("db_pool_evicted_dead_connections", **result)
+        except Exception as e:
+            logger.warning(f"Pool health check failed: {e}")
@@ -0,0 +1,149 @@
+"""
+Connection pool instrumentation.
+
+Tracks how long requests wait for a pool connection (histogram), how many
+connections are checked out / in overflow, pre-ping failures and the
+background health sweep (see pool_health). Each engine (primary, replica)
+keeps its own counters on its pool; pool_metrics_for(engine) returns them.
+Exposed through the admin diagnostics endpoint and a periodic structlog
+summary.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import settings
+
+logger = structlog.get_logger()
+
+# Upper bounds (ms) of the checkout wait histogram buckets; last bucket is +Inf
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.timeouts = 0  # No connection freed up within DB_POOL_TIMEOUT
+        self.connect_errors = 0  # Opening a new connection failed (database down, refused)
+        self.health_checks = 0
+        self.health_evictions = 0
+        self.disconnect_retries = 0
+
+    def record_wait(self, elapsed_ms: float):
+        self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+        self.wait_total_ms += elapsed_ms
+        self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+
+    def histogram(self) -> dict:
+        labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["le_inf"]
+        return dict(zip(labels, self.wait_buckets))
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout, including overflow
+    creation. Owns the engine's PoolMetrics; engine.dispose() recreates the
+    pool and the counters carry over.
+    """
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        except Exception:
+            self.metrics.connect_errors += 1
+            raise
+        finally:
+            self.metrics.record_wait((time.perf_counter() - start) * 1000)
+
+
+def pool_metrics_for(engine) -> PoolMetrics:
+    """Counters of an engine created with InstrumentedQueuePool (sync or async engine)"""
+    return engine.pool.metrics
+
+
+def instrument_engine(engine):
+    """Attach pool/engine event listeners to an AsyncEngine"""
+    sync_engine = engine.sync_engine
+    metrics = pool_metrics_for(sync_engine)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        if context.is_pre_ping:
+            metrics.pre_ping_failures += 1
+
+
+def pool_snapshot(engine) -> dict:
+    """Current pool state plus cumulative counters"""
+    pool = engine.pool
+    pool_metrics = pool_metrics_for(engine)
+    snapshot = {
+        "pool_class": type(pool).__name__,
+        "checkouts": pool_metrics.checkouts,
+        "connects": pool_metrics.connects,
+        "invalidations": pool_metrics.invalidations,
+        "pre_ping_failures": pool_metrics.pre_ping_failures,
+        "timeouts": pool_metrics.timeouts,
+        "connect_errors": pool_metrics.connect_errors,
+        "health_checks": pool_metrics.health_checks,
+        "health_evictions": pool_metrics.health_evictions,
+        "disconnect_retries": pool_metrics.disconnect_retries,
+        "wait_ms_total": round(pool_metrics.wait_total_ms, 1),
+        "wait_ms_max": round(pool_metrics.wait_max_ms, 1),
+        "wait_histogram": pool_metrics.histogram(),
+    }
+    if hasattr(pool, "checkedout"):
+        snapshot.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    return snapshot
+
+
+async def pool_stats_log_loop(engine, name: str = "primary"):
+    """Background task: periodic pool summary in the structured logs"""
+    interval = settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        snapshot = pool_snapshot(engine)
+        snapshot.pop("wait_histogram")
+        logger.info("db_pool_stats", engine=name, **snapshot)
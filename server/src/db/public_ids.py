@@ -0,0 +1,134 @@
+"""
+Race-free public ID allocation (ST-001, EMP-0001, ADM-001, ADM-2024-001).
+
+Numbers come from a database sequence (a counter row on SQLite), so
+concurrent creates and bulk imports never compute the same "last id + 1".
+They are drawn inside the caller's own transaction, on the request's
+session:
+
+- Postgres: nextval() is evaluated by the INSERT itself, so a create stays
+  one round trip. Numbers follow the shared sequence across workers; a
+  rolled-back INSERT leaves a gap (sequences are not transactional).
+- SQLite: the counter row is bumped on the session's connection just
+  before the INSERT and rolls back with it, so numbers have no gaps.
+
+The sequences and counter rows are created by migration v0006.
+"""
+from typing import Callable, Dict, Union
+
+from sqlalchemy import String, cast, func, insert, literal, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from src.db.models.admin import Admin
+from src.db.models.public_id_counter import PublicIdCounter
+from src.db.models.student import Student
+from src.db.models.teacher import Teacher
+
+# An allocated number: a Python int (SQLite) or a nextval() expression (Postgres)
+Number = Union[int, ColumnElement]
+
+
+class PublicIdAllocator:
+    def __init__(self, sequence_name: str, seed_column):
+        self.sequence_name = sequence_name
+        # Existing rows got their public ID from the primary key, so numbering
+        # continues after the current max(id)
+        self.seed_column = seed_column
+
+    async def next(self, db: AsyncSession) -> Number:
+        """
+        Next number for one INSERT on `db`. On Postgres this is the nextval()
+        call itself; each evaluation draws a new number, so a row that needs
+        it in several columns goes through insert_numbered().
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            return func.nextval(self.sequence_name)
+        return (await self.reserve(db, 1))[0]
+
+    async def reserve(self, db: AsyncSession, count: int) -> list[int]:
+        """Reserve `count` numbers in one statement on `db`'s transaction (bulk imports)"""
+        if db.get_bind().dialect.name == "postgresql":
+            result = await db.execute(
+                text(f"SELECT nextval('{self.sequence_name}') FROM generate_series(1, :count)"),
+                {"count": count}
+            )
+            return [row[0] for row in result]
+        result = await db.execute(
+            update(PublicIdCounter)
+            .where(PublicIdCounter.name == self.sequence_name)
+            .values(value=PublicIdCounter.value + count)
+            .returning(PublicIdCounter.value)
+        )
+        last = result.scalar_one()
+        return list(range(last - count + 1, last + 1))
+
+    async def sync(self, conn):
+        """Create the sequence (counter row) if missing and move it past the existing rows; never backwards"""
+        if conn.dialect.name == "postgresql":
+            table = self.seed_column.table.name
+            await conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {self.sequence_name}"))
+            await conn.execute(text(
+                f"SELECT setval('{self.sequence_name}', existing.max_id) "
+                f"FROM (SELECT max({self.seed_column.name}) AS max_id FROM {table}) AS existing, "
+                f"{self.sequence_name} AS seq WHERE existing.max_id >= seq.last_value"
+            ))
+            return
+        seed = select(func.coalesce(func.max(self.seed_column), 0)).scalar_subquery()
+        statement = sqlite_insert(PublicIdCounter).values(name=self.sequence_name, value=seed)
+        await conn.execute(statement.on_conflict_do_update(
+            index_elements=[PublicIdCounter.name],
+            set_={"value": func.max(PublicIdCounter.value, statement.excluded.value)}
+        ))
+
+
+student_numbers = PublicIdAllocator("student_public_id_seq", Student.id)
+teacher_numbers = PublicIdAllocator("teacher_public_id_seq", Teacher.id)
+admin_numbers = PublicIdAllocator("admin_public_id_seq", Admin.id)
+ALLOCATORS = [student_numbers, teacher_numbers, admin_numbers]
+
+
+async def sync_public_id_sequences(conn):
+    """Run by migration v0006 and after init_db seeds rows with explicit public IDs"""
+    for allocator in ALLOCATORS:
+        await allocator.sync(conn)
+
+
+def insert_numbered(model, values: dict, number: Number, numbered: Dict[str, Callable[[Number], object]]):
+    """
+    INSERT of one `model` row whose `numbered` columns (name -> formatter)
+    are derived from `number`. A nextval() number is selected once from a
+    subquery (INSERT ... SELECT), so every derived column sees the same value.
+    """
+    if isinstance(number, int):
+        return insert(model).values(**values, **{name: format_id(number) for name, format_id in numbered.items()})
+    drawn = select(number.label("number")).subquery("drawn")
+    columns = model.__table__.c
+    row = {name: literal(value, columns[name].type) for name, value in values.items()}
+    row.update({name: format_id(drawn.c.number) for name, format_id in numbered.items()})
+    return insert(model).from_select(list(row), select(*row.values()).select_from(drawn))
+
+
+def _format(prefix: str, number: Number, width: int):
+    """f"{prefix}{number:0{width}d}", in Python or (for a SQL number) in SQL"""
+    if isinstance(number, int):
+        return f"{prefix}{number:0{width}d}"
+    digits = cast(number, String)
+    return literal(prefix) + func.lpad(digits, func.greatest(width, func.length(digits)), "0")
+
+
+def format_student_id(number: Number):
+    return _format("ST-", number, 3)
+
+
+def format_admission_id(number: Number):
+    return _format("ADM-2024-", number, 3)
+
+
+def format_employee_id(number: Number):
+    return _format("EMP-", number, 4)
+
+
+def format_admin_id(number: Number):
+    return _format("ADM-", number, 3)
@@ -0,0 +1,88 @@
+"""
+Per-request SQL instrumentation.
+
+The log_requests middleware opens a RequestQueries collector in a contextvar;
+engine events record every statement the request runs into it. The totals
+go into the request log line and the Server-Timing header (outside
+production unless SERVER_TIMING_HEADER says otherwise). In development a
+statement that repeats more than SQL_REPEAT_WARN_THRESHOLD times in one
+request is logged as a likely N+1.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import structlog
+from sqlalchemy import event
+
+from src.core.config import settings
+
+logger = structlog.get_logger()
+
+SQL_LABEL_LENGTH = 200
+
+
+class RequestQueries:
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql: Optional[str] = None
+        self.shapes: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = statement
+
+        repeats = self.shapes.get(statement, 0) + 1
+        self.shapes[statement] = repeats
+        threshold = settings.SQL_REPEAT_WARN_THRESHOLD
+        if threshold > 0 and repeats == threshold + 1 and not settings.is_production:
+            logger.warning(
+                "possible_n_plus_one",
+                path=self.path,
+                repeats=repeats,
+                sql=_label(statement),
+            )
+
+    def log_fields(self, include_slowest: bool = False) -> dict:
+        fields = {"db_queries": self.count, "db_ms": round(self.total_ms, 1)}
+        if include_slowest and self.slowest_sql is not None:
+            fields["db_slowest_ms"] = round(self.slowest_ms, 1)
+            fields["db_slowest_sql"] = _label(self.slowest_sql)
+        return fields
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+
+def _label(statement: str) -> str:
+    return " ".join(statement.split())[:SQL_LABEL_LENGTH]
+
+
+# Set by the log_requests middleware; None outside a request (background tasks)
+current_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "current_request_queries", default=None
+)
+
+
+def instrument_request_queries(engine):
+    """Time every statement on an AsyncEngine into the current request's collector"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context so a failed statement leaves nothing behind
+        if context is not None:
+            context.query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        collector = current_request_queries.get()
+        start = getattr(context, "query_start", None)
+        if collector is not None and start is not None:
+            collector.record(statement, (time.perf_counter() - start) * 1000)
@@ -0,0 +1,41 @@
+"""
+Helpers for INSERT/UPDATE ... RETURNING writes.
+
+Write endpoints return the written row plus a few related values (class
+name, class teacher name). Looking those up with a scalar subquery inside
+RETURNING keeps every write to a single statement instead of a commit
+followed by a reload query.
+"""
+from sqlalchemy import func, literal_column, select
+
+# Separator for aggregate_strings; cannot appear in a class name
+AGGREGATE_SEPARATOR = "\x1f"
+
+
+def _written_column(column):
+    # Written out table-qualified: SQLAlchemy neither correlates INSERT
+    # RETURNING subqueries nor qualifies RETURNING columns on SQLite
+    return literal_column(f"{column.table.name}.{column.name}")
+
+
+def returning_lookup(value, key, column):
+    """Scalar subquery for RETURNING: `value` from the row whose `key` equals the written row's `column`"""
+    return select(value).where(key == _written_column(column)).scalar_subquery()
+
+
+def returning_count(key, column):
+    """Scalar subquery for RETURNING: number of rows whose `key` equals the written row's `column`"""
+    return select(func.count()).where(key == _written_column(column)).scalar_subquery()
+
+
+def returning_string_list(value, key, column):
+    """Scalar subquery for RETURNING: all matching `value`s joined; split with split_string_list"""
+    return (
+        select(func.aggregate_strings(value, AGGREGATE_SEPARATOR))
+        .where(key == _written_column(column))
+        .scalar_subquery()
+    )
+
+
+def split_string_list(joined) -> list:
+    return joined.split(AGGREGATE_SEPARATOR) if joined else []
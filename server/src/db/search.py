@@ -0,0 +1,54 @@
+"""
+Indexed substring search over name and public ID columns.
+
+A plain `ILIKE '%term%'` cannot use a btree index, so every search was a
+sequential scan. Migration v0005 adds the indexes this module queries:
+
+- Postgres: pg_trgm GIN indexes, which serve the same ILIKE filter;
+  results are ranked by trigram similarity() to the term.
+- SQLite: a trigram FTS5 table per searched table (e.g. students_search,
+  rowid = id); results are ranked prefix matches first, then shorter names.
+
+Trigrams need at least three characters, hence SEARCH_MIN_LENGTH.
+"""
+from sqlalchemy import case, func, literal_column, or_, select, table
+
+from src.core.config import settings
+from src.db.session import is_sqlite_url
+from src.db.models.student import Student
+from src.db.models.teacher import Teacher
+
+USE_FTS5 = is_sqlite_url(settings.DATABASE_URL)
+
+
+class SubstringSearch:
+    def __init__(self, model, columns: list, fts_table: str):
+        self.model = model
+        self.columns = columns
+        self.fts_table = fts_table
+
+    def matches(self, term: str):
+        """Filter: `term` occurs in any of the columns (case-insensitive)"""
+        if USE_FTS5:
+            # Quoted as one FTS5 phrase; the trigram tokenizer matches it as a substring
+            phrase = '"' + term.replace('"', '""') + '"'
+            matching_ids = (
+                select(literal_column("rowid"))
+                .select_from(table(self.fts_table))
+                .where(literal_column(self.fts_table).op("MATCH")(phrase))
+            )
+            return self.model.id.in_(matching_ids)
+        return or_(*(column.icontains(term, autoescape=True) for column in self.columns))
+
+    def ranking(self, term: str) -> list:
+        """ORDER BY clauses, best match first (id breaks ties)"""
+        name = self.columns[0]
+        if USE_FTS5:
+            prefix_first = case((name.istartswith(term, autoescape=True), 0), else_=1)
+            return [prefix_first, func.length(name), self.model.id]
+        similarity = func.greatest(*(func.similarity(column, term) for column in self.columns))
+        return [similarity.desc(), self.model.id]
+
+
+student_search = SubstringSearch(Student, [Student.name, Student.student_id], "students_search")
+teacher_search = SubstringSearch(Teacher, [Teacher.name, Teacher.employee_id], "teachers_search")
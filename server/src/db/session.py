@@ -1,46 +1,228 @@
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from fastapi import Request
 from src.core.config import settings
+from src.db.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_metrics_for
+from src.db.statement_stats import instrument_statements
+from src.db.request_queries import instrument_request_queries
+from uuid import uuid4
 import re
+import time
+
+
+def normalize_database_url(url: str) -> str:
+    """Rewrite a Neon/Postgres URL for asyncpg, or a SQLite URL for aiosqlite"""
+    if url and url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url and url.startswith("sqlite+"):
+        return url
+
+    if url and url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    elif url and url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql+asyncpg://", 1)
+
+    # Fix sslmode param for asyncpg
+    if "sslmode=require" in url:
+        url = url.replace("sslmode=require", "ssl=require")
+
+    # Remove unsupported params for asyncpg (e.g. channel_binding)
+    return re.sub(r'[?&]channel_binding=[^&]+', '', url)
+
+
+def _uses_pgbouncer(url: str) -> bool:
+    if settings.DB_PGBOUNCER is not None:
+        return settings.DB_PGBOUNCER
+    # Neon's pooled endpoints carry a "-pooler" suffix on the host
+    return "-pooler." in url
+
+
+def _asyncpg_connect_args(url: str) -> dict:
+    """
+    Prepared statement settings for asyncpg.
+
+    SQLAlchemy keeps its own per-connection cache of prepared statements
+    (prepared_statement_cache_size). Behind pgbouncer in transaction mode a
+    connection can land on different server sessions, so asyncpg's own
+    named cache is disabled and every statement gets a unique name; the
+    pooler re-prepares them server-side as needed.
+    """
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if _uses_pgbouncer(url):
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return connect_args
+
+
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _apply_sqlite_pragmas(sync_engine):
+    """
+    Single-node mode: WAL lets readers run alongside the one writer, and
+    synchronous=NORMAL is durable under WAL except for an OS crash in the
+    last few commits. mmap and a larger page cache keep hot pages in memory.
+    """
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def _create_engine(url: str):
+    sqlite = is_sqlite_url(url)
+    # echo=True enables SQL logging (useful for dev)
+    new_engine = create_async_engine(
+        normalize_database_url(url),
+        echo=False,
+        future=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,  # Compiled statement cache
+        connect_args={} if sqlite else _asyncpg_connect_args(url),
+        poolclass=InstrumentedQueuePool,  # Times checkout waits (see pool_metrics)
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+    if sqlite:
+        _apply_sqlite_pragmas(new_engine.sync_engine)
+    instrument_engine(new_engine)
+    instrument_statements(new_engine)
+    instrument_request_queries(new_engine)
+    return new_engine
+
+
+# Create Async Engines: primary for writes, optional replica for reads
+engine = _create_engine(settings.DATABASE_URL)
+read_engine = _create_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+
+
+# ==================== READ-YOUR-WRITES PINNING ====================
+# After an admin writes, their reads stay on the primary for a few seconds
+# so they never see replica lag on their own changes.
+_pinned_until: dict[int, float] = {}
+
+
+def pin_to_primary(admin_pk: int):
+    _pinned_until[admin_pk] = time.monotonic() + settings.READ_YOUR_WRITES_SECONDS
+
+
+def is_pinned(admin_pk: int) -> bool:
+    until = _pinned_until.get(admin_pk)
+    if until is None:
+        return False
+    if time.monotonic() >= until:
+        del _pinned_until[admin_pk]
+        return False
+    return True
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to the replica when the request opted in (see
+    prefer_read_replica) and the admin is not pinned; everything else,
+    including flushes and DML, goes to the primary. Once the session has
+    written, its later reads stay on the primary too.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            read_engine is not None
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+            and self._replica_allowed()
+        ):
+            return read_engine.sync_engine
+        return engine.sync_engine
+
+    def _replica_allowed(self) -> bool:
+        if self.info.get("wrote"):
+            return False
+        request = self.info.get("request")
+        if request is None or not getattr(request.state, "read_replica", False):
+            return False
+        admin_pk = getattr(request.state, "admin_pk", None)
+        return admin_pk is None or not is_pinned(admin_pk)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+class RetryingAsyncSession(AsyncSession):
+    """
+    Retries a statement once when it fails on a connection that died while
+    idle in the pool (pre-ping is off, see pool_health).
+
+    Only the first statement of a transaction on an empty session is retried:
+    nothing can have been applied or loaded yet, so rolling back and running
+    it again on a fresh connection is safe.
+    """
+
+    async def execute(self, statement, params=None, **kw):
+        retryable = not self.in_transaction() and not self.identity_map
+        try:
+            return await super().execute(statement, params, **kw)
+        except DBAPIError as e:
+            if not (retryable and e.connection_invalidated):
+                raise
+            await self.rollback()
+            pool_metrics_for(self.sync_session.get_bind(clause=statement)).disconnect_retries += 1
+            return await super().execute(statement, params, **kw)
 
-# Create Async Engine
-# echo=True enables SQL logging (useful for dev)
-database_url = settings.DATABASE_URL
-if database_url and database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif database_url and database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-
-# Fix sslmode param for asyncpg
-if "sslmode=require" in database_url:
-    database_url = database_url.replace("sslmode=require", "ssl=require")
-
-# Remove unsupported params for asyncpg (e.g. channel_binding)
-database_url = re.sub(r'[?&]channel_binding=[^&]+', '', database_url)
-
-engine = create_async_engine(
-    database_url,
-    echo=False, 
-    future=True,
-    pool_pre_ping=True,  # Check connection before using
-    pool_recycle=300,    # Recycle connections every 5 minutes
-    pool_size=5,
-    max_overflow=10
-)
 
 # Create Session Factory
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=RetryingAsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autoflush=False
 )
 
-async def get_db() -> AsyncSession:
+
+async def prefer_read_replica(request: Request):
+    """
+    Router dependency: allow this request's GET reads to use READ_DATABASE_URL.
+    Routing is decided per statement, so auth can still pin the admin first.
+    """
+    if request.method == "GET":
+        request.state.read_replica = True
+
+
+async def get_db(request: Request) -> AsyncSession:
     """
-    Dependency to yield database sessions.
+    Dependency to yield the request-scoped database session.
+
+    Every router and auth dependency must use this one function: FastAPI
+    caches dependencies per request, so deps and handlers share a single
+    session. The session only checks out a pool connection on its first
+    execute, so requests served from caches never touch the pool.
     """
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(info={"request": request}) as session:
         try:
             yield session
         finally:
+            admin_pk = getattr(request.state, "admin_pk", None)
+            if session.info.get("wrote") and admin_pk is not None:
+                pin_to_primary(admin_pk)
             await session.close()
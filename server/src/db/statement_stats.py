@@ -0,0 +1,62 @@
+"""
+Per-statement compile and execute counters.
+
+SQLAlchemy compiles a statement once per cache key and reuses the compiled
+form afterwards (lambda statements skip even the cache key rebuild). These
+counters show, per SQL string, how often it executed and how often it had to
+be compiled, so a hot query that keeps missing the cache stands out.
+Exposed through the admin diagnostics endpoint.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
+
+MAX_TRACKED_STATEMENTS = 500
+LABEL_LENGTH = 160
+
+
+class StatementStats:
+    def __init__(self):
+        self.statements: dict[str, dict] = {}
+        self.untracked_executes = 0
+
+    def record(self, statement: str, cache_hit: bool):
+        entry = self.statements.get(statement)
+        if entry is None:
+            if len(self.statements) >= MAX_TRACKED_STATEMENTS:
+                self.untracked_executes += 1
+                return
+            entry = self.statements[statement] = {"executes": 0, "compiles": 0}
+        entry["executes"] += 1
+        if not cache_hit:
+            entry["compiles"] += 1
+
+    def snapshot(self, limit: int = 50) -> dict:
+        ordered = sorted(self.statements.items(), key=lambda item: item[1]["executes"], reverse=True)
+        return {
+            "tracked": len(self.statements),
+            "untracked_executes": self.untracked_executes,
+            "executes": sum(entry["executes"] for entry in self.statements.values()),
+            "compiles": sum(entry["compiles"] for entry in self.statements.values()),
+            "statements": [
+                {"sql": " ".join(sql.split())[:LABEL_LENGTH], **entry}
+                for sql, entry in ordered[:limit]
+            ],
+        }
+
+    def reset(self):
+        self.statements.clear()
+        self.untracked_executes = 0
+
+
+statement_stats = StatementStats()
+
+
+def instrument_statements(engine):
+    """Count executes and compiles per statement on an AsyncEngine"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is None or context.compiled is None:
+            # Driver-level SQL (exec_driver_sql) is never compiled
+            return
+        statement_stats.record(statement, context.cache_hit is CACHE_HIT)
@@ -1,13 +1,20 @@
-from fastapi import FastAPI, Request
+# First import: starts the cold start clock before the heavy imports below
+from src.core.cold_start import cold_start
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from fastapi.responses import JSONResponse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 import structlog
 import time
 
 from src.core.config import settings
 from src.core.logging import setup_logging
+from src.core.security import PasswordHashingBusy
+from src.core.rate_limit import limiter, rate_limit_flush_loop
+from src.db.session import prefer_read_replica
+from src.db.request_queries import RequestQueries, current_request_queries
 from src.api.v1.endpoints import health, auth
 
 # Initialize logging (dev_mode in development, JSON in production)
@@ -28,19 +35,29 @@ SKIP_LOG_PATHS = {"/", "/favicon.ico", "/api/v1/health"}
 async def log_requests(request: Request, call_next):
     """
     Middleware to log all API requests with clean, readable format.
-    Logs: method, path, status, duration, and highlights slow requests.
+    Logs: method, path, status, duration, SQL count/time, and highlights slow requests.
     """
     # Skip noisy paths
     if request.url.path in SKIP_LOG_PATHS:
-        return await call_next(request)
+        response = await call_next(request)
+        if cold_start.first_response_ms is None:
+            cold_start.mark_first_response(request.url.path)
+        return response
     
     start_time = time.time()
+    queries = RequestQueries(request.url.path)
+    queries_token = current_request_queries.set(queries)
     
     # Process request
-    response = await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_queries.reset(queries_token)
     
     # Calculate duration
     duration_ms = (time.time() - start_time) * 1000
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = f"{queries.server_timing()}, app;dur={duration_ms:.1f}"
     
     # Determine log level based on status and duration
     status = response.status_code
@@ -53,12 +70,16 @@ async def log_requests(request: Request, call_next):
         "path": request.url.path,
         "status": status,
         "ms": round(duration_ms, 1),
+        **queries.log_fields(include_slowest=is_slow),
     }
     
     # Add query params if present
     if request.url.query:
         log_data["query"] = request.url.query[:100]  # Truncate long queries
     
+    if cold_start.first_response_ms is None:
+        cold_start.mark_first_response(request.url.path)
+    
     # Log with appropriate level
     if is_error:
         logger.warning("api_request", **log_data)
@@ -92,13 +113,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor (src/api/v1/pagination.py)
 )
 
-# Rate Limiting
-limiter = Limiter(key_func=get_remote_address)
+# Rate Limiting (shared limiter, see src/core/rate_limit.py)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    """Password worker pool is saturated - shed load instead of queueing"""
+    logger.warning("password_pool_saturated", path=request.url.path)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
 @app.get("/")
 async def root():
     """
@@ -113,6 +145,7 @@ async def root():
 
 
 # Include Routers
+# Routers with prefer_read_replica send their GET reads to READ_DATABASE_URL
 app.include_router(health.router, prefix=settings.API_V1_STR, tags=["health"])
 app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["auth"])
 
@@ -122,57 +155,165 @@ app.include_router(admins.router, prefix=f"{settings.API_V1_STR}/admins", tags=[
 
 # Students routes
 from src.api.v1.endpoints import students
-app.include_router(students.router, prefix=f"{settings.API_V1_STR}/students", tags=["students"])
+app.include_router(students.router, prefix=f"{settings.API_V1_STR}/students", tags=["students"], dependencies=[Depends(prefer_read_replica)])
 
 # Classes routes
 from src.api.v1.endpoints import classes
-app.include_router(classes.router, prefix=f"{settings.API_V1_STR}/classes", tags=["classes"])
+app.include_router(classes.router, prefix=f"{settings.API_V1_STR}/classes", tags=["classes"], dependencies=[Depends(prefer_read_replica)])
 
 # Teachers routes
 from src.api.v1.endpoints import teachers
-app.include_router(teachers.router, prefix=f"{settings.API_V1_STR}/teachers", tags=["teachers"])
+app.include_router(teachers.router, prefix=f"{settings.API_V1_STR}/teachers", tags=["teachers"], dependencies=[Depends(prefer_read_replica)])
 
 # Exams routes
 from src.api.v1.endpoints import exams
-app.include_router(exams.router, prefix=f"{settings.API_V1_STR}/exams", tags=["exams"])
+app.include_router(exams.router, prefix=f"{settings.API_V1_STR}/exams", tags=["exams"], dependencies=[Depends(prefer_read_replica)])
 
 # Applications routes
 from src.api.v1.endpoints import applications
-app.include_router(applications.router, prefix=f"{settings.API_V1_STR}/applications", tags=["applications"])
+app.include_router(applications.router, prefix=f"{settings.API_V1_STR}/applications", tags=["applications"], dependencies=[Depends(prefer_read_replica)])
 
 # Contact requests routes
 from src.api.v1.endpoints import contacts
-app.include_router(contacts.router, prefix=f"{settings.API_V1_STR}/contacts", tags=["contacts"])
+app.include_router(contacts.router, prefix=f"{settings.API_V1_STR}/contacts", tags=["contacts"], dependencies=[Depends(prefer_read_replica)])
 
 # Site content routes (CMS)
 from src.api.v1.endpoints import site_content
-app.include_router(site_content.router, prefix=f"{settings.API_V1_STR}/site-content", tags=["site-content"])
+app.include_router(site_content.router, prefix=f"{settings.API_V1_STR}/site-content", tags=["site-content"], dependencies=[Depends(prefer_read_replica)])
+
+# Admin quick-search (in-memory typeahead, no database round trip)
+from src.api.v1.endpoints import search
+app.include_router(search.router, prefix=f"{settings.API_V1_STR}/search", tags=["search"])
+
+# Diagnostics routes (pool/cache telemetry)
+from src.api.v1.endpoints import diagnostics
+app.include_router(diagnostics.router, prefix=f"{settings.API_V1_STR}/diagnostics", tags=["diagnostics"])
 
-# Keep-Alive Background Task (Render)
 import asyncio
-import httpx
 
-@app.on_event("startup")
-async def startup_event():
+cold_start.mark_imported()
+
+
+async def warm_up_database(engine):
     """
-    Startup events:
-    1. Check DB connection.
-    2. Initialize DB (Tables + Seed).
-    3. Start Keep-Alive task (if configured).
+    Background startup stage: open the first pool connection and compare the
+    schema version (a schema behind LATEST_VERSION fails readiness, see
+    health_check), then (STARTUP_WARMUP) fill the pool and the public page cache.
     """
-    # 1. Check DB
     try:
-        from sqlalchemy import text
-        from src.db.session import engine
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
-        logger.info("Database connection established successfully.")
+        from src.db.migrations import LATEST_VERSION, current_version
+        version = await current_version(engine)
+        cold_start.mark_db_ready()
+        health.schema_behind = version < LATEST_VERSION
+        logger.info("Database connection established successfully.", schema_version=version)
+        if version < LATEST_VERSION:
+            # /health answers 503 until the schema catches up
+            logger.error(
+                "Database schema is behind - run: python -m scripts.migrate",
+                schema_version=version,
+                latest=LATEST_VERSION
+            )
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
+        return
+
+    if settings.STARTUP_WARMUP:
+        await warm_up(engine)
+
+
+async def warm_up(engine):
+    """Prefill the connection pools, then preload prerendered pages with one query"""
+    from src.db.pool_health import prefill_pool
+    from src.db.session import AsyncSessionLocal, read_engine
+    from src.api.v1.endpoints.site_content import warm_page_cache
+
+    start = time.perf_counter()
+    try:
+        connections = await prefill_pool(engine, settings.DB_POOL_SIZE)
+        if read_engine is not None:
+            connections += await prefill_pool(read_engine, settings.DB_POOL_SIZE)
+        pool_ms = (time.perf_counter() - start) * 1000
 
-    # 2. Keep Alive
+        pages_start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            sections = await warm_page_cache(db, settings.WARMUP_PAGE_SLUGS)
+        pages_ms = (time.perf_counter() - pages_start) * 1000
+    except Exception as e:
+        logger.warning(f"Startup warm-up failed: {e}")
+        return
+
+    logger.info(
+        "startup_warmup",
+        connections=connections,
+        pool_ms=round(pool_ms, 1),
+        pages=len(settings.WARMUP_PAGE_SLUGS),
+        sections=sections,
+        pages_ms=round(pages_ms, 1),
+        total_ms=round((time.perf_counter() - start) * 1000, 1),
+    )
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Startup events:
+    1. Check DB connection and schema version, then warm up the pool and
+       page cache (background, does not delay serving).
+    2. Start token version refresh.
+    3. Start periodic pool stats logging.
+    4. Start background pool health checks.
+    5. Start rate limit counter flushing (database storage only).
+    6. Start refresh token reaper.
+    7. Build the typeahead index and keep it refreshed.
+    8. Start Keep-Alive task (if configured).
+    """
+    # 1. Check DB and schema version (DDL runs in scripts.migrate, not here),
+    # then warm up. The first connect to a sleeping database can take seconds,
+    # so this runs in the background; only opt-in startup migrations hold up serving.
+    from src.db.session import engine
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        try:
+            from src.db.migrations import run_migrations
+            await run_migrations(engine)
+        except Exception as e:
+            logger.error(f"Database migration failed: {e}")
+    asyncio.create_task(warm_up_database(engine))
+
+    # 2. Token version table: claims-mode tokens and cached principals are
+    # checked against it, so other workers' admin changes apply here too
+    from src.core.token_versions import token_version_refresh_loop
+    asyncio.create_task(token_version_refresh_loop())
+
+    # 3. Periodic pool summary, per engine
+    from src.db.pool_metrics import pool_stats_log_loop
+    from src.db.session import read_engine
+    asyncio.create_task(pool_stats_log_loop(engine))
+    if read_engine is not None:
+        asyncio.create_task(pool_stats_log_loop(read_engine, "replica"))
+
+    # 4. Background health sweep of idle pool connections (replaces pre-ping)
+    from src.db.pool_health import pool_health_loop
+    asyncio.create_task(pool_health_loop(engine))
+    if read_engine is not None:
+        asyncio.create_task(pool_health_loop(read_engine))
+
+    # 5. Shared rate limit counters (database storage only)
+    asyncio.create_task(rate_limit_flush_loop())
+
+    # 6. Refresh token reaper
+    from src.api.v1.endpoints.auth import refresh_token_reaper_loop
+    asyncio.create_task(refresh_token_reaper_loop())
+
+    # 7. Admin quick-search index
+    from src.core.typeahead import typeahead_refresh_loop
+    asyncio.create_task(typeahead_refresh_loop())
+
+    # 8. Keep Alive
     await start_keep_alive()
 
+    cold_start.mark_ready()
+
+# Keep-Alive Background Task (Render)
 async def start_keep_alive():
     """
     Starts a background task to ping the server every 30 seconds
@@ -192,6 +333,9 @@ async def start_keep_alive():
     asyncio.create_task(keep_alive_loop())
 
 async def keep_alive_loop():
+    # Imported here: only production with RENDER_EXTERNAL_URL needs an HTTP client
+    import httpx
+
     base_url = settings.RENDER_EXTERNAL_URL.rstrip("/")
     url = f"{base_url}{settings.API_V1_STR}/health"
     async with httpx.AsyncClient() as client:
@@ -0,0 +1,69 @@
+"""
+Shared test fixtures.
+
+Tests run against throwaway SQLite files (aiosqlite). Settings are read
+when src.core.config is first imported, so the environment is set here,
+before any application module is imported.
+
+    pip install -e ".[sqlite,dev]" && pytest
+"""
+import os
+import shutil
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="school-p2-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATA_DIR}/primary.db"
+# Never pick up a developer's .env replica; test_read_routing builds its own
+os.environ["READ_DATABASE_URL"] = ""
+os.environ["ENVIRONMENT"] = "development"
+
+import httpx
+import pytest
+from sqlalchemy import insert
+
+from src.main import app
+from src.core.security import create_access_token
+from src.api.v1.deps import principal_cache
+from src.db.migrations import run_migrations
+from src.db.models.admin import Admin, admin_permission_mask
+from src.db.session import engine
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session: pooled aiosqlite connections are bound to it
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def principal_pk(anyio_backend) -> int:
+    """Migrated database with one PRINCIPAL admin; returns its primary key"""
+    await run_migrations(engine)
+    async with engine.begin() as conn:
+        result = await conn.execute(insert(Admin).values(
+            admin_id="ADM-900",
+            username="test-principal",
+            hashed_password="!",  # Never logs in; tests sign their own tokens
+            role="PRINCIPAL",
+            full_name="Test Principal",
+            permissions=[],
+            permission_mask=admin_permission_mask("PRINCIPAL", []),
+            is_active=True,
+        ).returning(Admin.id))
+        admin_pk = result.scalar_one()
+    yield admin_pk
+    await engine.dispose()
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+async def client(principal_pk):
+    """API client authenticated as the test Principal (base URL includes /api/v1)"""
+    token = create_access_token(principal_pk)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test/api/v1",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as api:
+        yield api
+    principal_cache.clear()
@@ -0,0 +1,117 @@
+"""
+Refresh token cookie: set HttpOnly on login, rotated by POST /refresh,
+dropped by DELETE /refresh, never returned in a response body.
+"""
+import httpx
+import pytest
+from sqlalchemy import insert
+
+from src.main import app
+from src.api.v1.endpoints.auth import REFRESH_COOKIE, REFRESH_COOKIE_PATH
+from src.core import security
+from src.db.models.admin import Admin, admin_permission_mask
+from src.db.session import engine
+
+pytestmark = pytest.mark.anyio
+
+USERNAME = "test-refresh"
+PASSWORD = "correct horse battery"
+
+
+@pytest.fixture(scope="module")
+async def account(principal_pk):
+    async with engine.begin() as conn:
+        await conn.execute(insert(Admin).values(
+            admin_id="ADM-901",
+            username=USERNAME,
+            hashed_password=security.get_password_hash(PASSWORD),
+            role="ADMIN",
+            full_name="Refresh Tester",
+            permissions=[],
+            permission_mask=admin_permission_mask("ADMIN", []),
+            is_active=True,
+        ))
+
+
+@pytest.fixture
+async def browser(account):
+    # https: the cookie is Secure
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="https://test/api/v1"
+    ) as api:
+        yield api
+
+
+async def _login(browser) -> httpx.Response:
+    response = await browser.post("/login/access-token", data={"username": USERNAME, "password": PASSWORD})
+    assert response.status_code == 200
+    return response
+
+
+def _present(browser, token: str):
+    """Make `token` the only refresh cookie the client sends"""
+    browser.cookies.clear()
+    browser.cookies.set(REFRESH_COOKIE, token)
+
+
+async def test_login_sets_http_only_cookie(browser):
+    response = await _login(browser)
+    assert "refresh_token" not in response.json()
+
+    cookie = response.headers["set-cookie"].lower()
+    assert cookie.startswith(f"{REFRESH_COOKIE}=")
+    for attribute in ("httponly", "secure", "samesite=strict", f"path={REFRESH_COOKIE_PATH}"):
+        assert attribute in cookie
+
+
+async def test_refresh_rotates_cookie_and_detects_reuse(browser):
+    await _login(browser)
+    first = browser.cookies[REFRESH_COOKIE]
+
+    response = await browser.post("/refresh")
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+    assert "refresh_token" not in response.json()
+    second = browser.cookies[REFRESH_COOKIE]
+    assert second != first
+
+    # Replaying the rotated token ends every session, including the new one
+    _present(browser, first)
+    assert (await browser.post("/refresh")).status_code == 401
+    _present(browser, second)
+    assert (await browser.post("/refresh")).status_code == 401
+
+
+async def test_refresh_without_cookie_is_rejected(browser):
+    assert (await browser.post("/refresh")).status_code == 401
+
+
+async def test_logout_drops_refresh_token(browser):
+    await _login(browser)
+    token = browser.cookies[REFRESH_COOKIE]
+
+    response = await browser.delete("/refresh")
+    assert response.status_code == 204
+    assert REFRESH_COOKIE not in browser.cookies
+
+    _present(browser, token)
+    assert (await browser.post("/refresh")).status_code == 401
+
+
+async def test_password_change_keeps_only_this_session(browser, account):
+    await _login(browser)
+    other = browser.cookies[REFRESH_COOKIE]  # A second browser's session
+    response = await _login(browser)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await browser.put("/me/password", headers=headers, json={
+        "current_password": PASSWORD, "new_password": PASSWORD,
+    })
+    assert response.status_code == 200
+    assert "refresh_token" not in response.json()
+    mine = browser.cookies[REFRESH_COOKIE]
+
+    _present(browser, other)
+    assert (await browser.post("/refresh")).status_code == 401
+    _present(browser, mine)
+    assert (await browser.post("/refresh")).status_code == 200
@@ -0,0 +1,36 @@
+"""
+Readiness: /health fails while the schema is behind the code and recovers
+once the migrations have been applied.
+"""
+import pytest
+
+from src.api.v1.endpoints import health
+from src.db import migrations
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def behind(monkeypatch):
+    monkeypatch.setattr(health, "schema_behind", True)
+
+
+async def test_health_ok(client):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+async def test_health_fails_while_schema_behind(client, behind, monkeypatch):
+    monkeypatch.setattr(migrations, "LATEST_VERSION", migrations.LATEST_VERSION + 1)
+    response = await client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["schema"] == "behind"
+    assert health.schema_behind
+
+
+async def test_health_recovers_after_migration(client, behind):
+    # The test database is fully migrated: the re-read clears the flag
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert not health.schema_behind
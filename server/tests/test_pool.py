@@ -0,0 +1,125 @@
+"""
+Pool checkouts per request (one lazily-connected session per request) and
+the background health sweep over idle connections.
+"""
+import pytest
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from src.api.v1.deps import principal_cache
+from src.core.config import settings
+from src.db import session as db_session
+from src.api.v1.endpoints.site_content import invalidate_cache
+from src.db.pool_health import check_idle_connections, prefill_pool
+from src.db.pool_metrics import pool_metrics_for
+from src.db.session import engine
+
+pool_metrics = pool_metrics_for(engine)
+
+pytestmark = pytest.mark.anyio
+
+
+async def _get_counting_checkouts(client, url: str):
+    before = pool_metrics.checkouts
+    response = await client.get(url)
+    return response, pool_metrics.checkouts - before
+
+
+async def test_protected_request_shares_one_connection(client):
+    # Principal cache miss: the auth dependency and the handler both query
+    principal_cache.clear()
+    response, checkouts = await _get_counting_checkouts(client, "/students/")
+    assert response.status_code == 200
+    assert checkouts == 1
+
+
+async def test_cached_public_page_checks_out_no_connection(client):
+    invalidate_cache()
+    response, checkouts = await _get_counting_checkouts(client, "/site-content/public/home")
+    assert response.status_code == 200
+    assert checkouts == 1
+
+    response, checkouts = await _get_counting_checkouts(client, "/site-content/public/home")
+    assert response.status_code == 200
+    assert checkouts == 0
+
+
+async def test_checkout_wait_is_recorded(principal_pk):
+    checkouts = pool_metrics.checkouts
+    waits = sum(pool_metrics.wait_buckets)
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SELECT 1")
+    assert pool_metrics.checkouts == checkouts + 1
+    assert sum(pool_metrics.wait_buckets) == waits + 1
+
+
+async def test_health_check_probes_every_idle_connection(principal_pk):
+    await engine.dispose()
+    assert await prefill_pool(engine, 3) == 3
+    assert engine.pool.checkedin() == 3
+
+    health_checks = pool_metrics.health_checks
+    assert await check_idle_connections(engine) == {"checked": 3, "evicted": 0}
+    assert pool_metrics.health_checks == health_checks + 3
+    assert engine.pool.checkedin() == 3
+
+
+async def test_health_check_evicts_dead_connection(principal_pk):
+    await engine.dispose()
+    assert await prefill_pool(engine, 2) == 2
+
+    # Close one connection while it sits idle in the pool, as a server-side
+    # idle timeout would
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        victim = raw.driver_connection
+    await victim.close()
+
+    evictions = pool_metrics.health_evictions
+    invalidations = pool_metrics.invalidations
+    assert await check_idle_connections(engine) == {"checked": 1, "evicted": 1}
+    assert pool_metrics.health_evictions == evictions + 1
+    assert pool_metrics.invalidations == invalidations + 1
+
+    # The evicted connection reconnects on its next checkout
+    assert await check_idle_connections(engine) == {"checked": 2, "evicted": 0}
+
+
+async def test_metrics_are_per_engine_and_survive_dispose(principal_pk, tmp_path):
+    other = db_session._create_engine(f"sqlite:///{tmp_path}/other.db")
+    try:
+        checkouts = pool_metrics.checkouts
+        async with other.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+        assert pool_metrics_for(other).checkouts == 1
+        assert pool_metrics.checkouts == checkouts
+    finally:
+        await other.dispose()
+    assert pool_metrics_for(other).checkouts == 1
+
+    await engine.dispose()
+    assert pool_metrics_for(engine) is pool_metrics
+
+
+async def test_timeout_counted_apart_from_connect_errors(principal_pk, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.1)
+    small = db_session._create_engine(f"sqlite:///{tmp_path}/small.db")
+    metrics = pool_metrics_for(small)
+    try:
+        async with small.connect():
+            with pytest.raises(PoolTimeoutError):
+                await small.connect()
+        assert (metrics.timeouts, metrics.connect_errors) == (1, 0)
+    finally:
+        await small.dispose()
+
+    # The database cannot be opened: a connect error, not a timeout
+    unreachable = db_session._create_engine(f"sqlite:///{tmp_path}/missing/dir.db")
+    metrics = pool_metrics_for(unreachable)
+    try:
+        with pytest.raises(OperationalError):
+            await unreachable.connect()
+        assert (metrics.timeouts, metrics.connect_errors) == (0, 1)
+    finally:
+        await unreachable.dispose()
@@ -0,0 +1,67 @@
+"""
+Cached principals and admin changes made through another worker: the local
+invalidate_principal never runs here, so the version table reload is what
+expires the cached entry.
+"""
+import pytest
+from sqlalchemy import delete, insert, update
+
+from src.api.v1.deps import principal_cache
+from src.core.security import create_access_token
+from src.core.token_versions import refresh_token_versions
+from src.db.models.admin import Admin, admin_permission_mask
+from src.db.session import engine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def admin_pk(principal_pk):
+    async with engine.begin() as conn:
+        result = await conn.execute(insert(Admin).values(
+            admin_id="ADM-902",
+            username="test-other-worker",
+            hashed_password="!",
+            role="ADMIN",
+            full_name="Other Worker",
+            permissions=[],
+            permission_mask=admin_permission_mask("ADMIN", []),
+            token_version=0,
+            is_active=True,
+        ).returning(Admin.id))
+        admin_pk = result.scalar_one()
+    await refresh_token_versions()
+    yield admin_pk
+    async with engine.begin() as conn:
+        await conn.execute(delete(Admin).filter(Admin.id == admin_pk))
+    principal_cache.pop(admin_pk)
+    await refresh_token_versions()
+
+
+async def _me(client, admin_pk):
+    return await client.get("/me", headers={"Authorization": f"Bearer {create_access_token(admin_pk)}"})
+
+
+async def test_deactivation_elsewhere_expires_cached_principal(client, admin_pk):
+    assert (await _me(client, admin_pk)).status_code == 200
+    assert principal_cache.get(admin_pk) is not None
+
+    # Another worker deactivates the admin (and bumps the version, as update_admin does)
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Admin).filter(Admin.id == admin_pk).values(is_active=False, token_version=1)
+        )
+    # Until this worker's version table reloads, the cached entry is served
+    assert (await _me(client, admin_pk)).status_code == 200
+
+    await refresh_token_versions()
+    assert (await _me(client, admin_pk)).status_code == 403
+
+
+async def test_deletion_elsewhere_expires_cached_principal(client, admin_pk):
+    assert (await _me(client, admin_pk)).status_code == 200
+
+    async with engine.begin() as conn:
+        await conn.execute(delete(Admin).filter(Admin.id == admin_pk))
+    await refresh_token_versions()
+    assert (await _me(client, admin_pk)).status_code == 401
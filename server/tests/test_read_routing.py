@@ -0,0 +1,97 @@
+"""
+Read-replica routing. A second SQLite file stands in for READ_DATABASE_URL;
+each database holds a student the other lacks, so responses show which one
+served a read.
+"""
+from types import SimpleNamespace
+
+import anyio
+import pytest
+from sqlalchemy import insert, select
+
+from src.core.config import settings
+from src.db import session as db_session
+from src.db.migrations import run_migrations
+from src.db.models.admin import Admin
+from src.db.models.student import Student
+
+pytestmark = pytest.mark.anyio
+
+REPLICA_STUDENT = "Replica Only"
+PRIMARY_STUDENT = "Primary Only"
+
+
+@pytest.fixture(scope="module")
+async def replica_engine(principal_pk, tmp_path_factory):
+    replica = db_session._create_engine(f"sqlite:///{tmp_path_factory.mktemp('replica')}/replica.db")
+    await run_migrations(replica)
+    async with db_session.engine.connect() as conn:
+        admin = (await conn.execute(select(Admin.__table__).filter(Admin.id == principal_pk))).one()
+    async with replica.begin() as conn:
+        # Replicated admin row: auth lookups on GET requests read the replica too
+        await conn.execute(insert(Admin.__table__).values(**admin._mapping))
+        await conn.execute(insert(Student).values(student_id="ST-R01", name=REPLICA_STUDENT, is_active=True))
+    async with db_session.engine.begin() as conn:
+        await conn.execute(insert(Student).values(student_id="ST-P01", name=PRIMARY_STUDENT, is_active=True))
+    yield replica
+    await replica.dispose()
+
+
+@pytest.fixture
+def replica(replica_engine, monkeypatch):
+    monkeypatch.setattr(db_session, "read_engine", replica_engine)
+    db_session._pinned_until.clear()
+    yield replica_engine
+    db_session._pinned_until.clear()
+
+
+async def _listed_names(client) -> set:
+    response = await client.get("/students/", params={"limit": 200})
+    assert response.status_code == 200
+    return {student["name"] for student in response.json()}
+
+
+async def _names_in(engine) -> set:
+    async with engine.connect() as conn:
+        return set((await conn.execute(select(Student.name))).scalars())
+
+
+async def test_get_reads_from_replica(client, replica):
+    names = await _listed_names(client)
+    assert REPLICA_STUDENT in names
+    assert PRIMARY_STUDENT not in names
+
+
+async def test_write_goes_to_primary_and_pins_reads(client, replica, monkeypatch):
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.5)
+
+    response = await client.post("/students/", json={"name": "Routing Write"})
+    assert response.status_code == 201
+    assert "Routing Write" in await _names_in(db_session.engine)
+    assert "Routing Write" not in await _names_in(replica)
+
+    # Within the pin window the writer reads its own write from the primary
+    names = await _listed_names(client)
+    assert "Routing Write" in names
+    assert REPLICA_STUDENT not in names
+
+    await anyio.sleep(0.6)
+    names = await _listed_names(client)
+    assert REPLICA_STUDENT in names
+    assert "Routing Write" not in names
+
+
+async def test_flush_goes_to_primary_then_reads_stay_there(replica):
+    # An opted-in request: reads may use the replica
+    request = SimpleNamespace(state=SimpleNamespace(read_replica=True, admin_pk=None))
+    async with db_session.AsyncSessionLocal(info={"request": request}) as db:
+        assert (await db.execute(select(Student.id).filter(Student.name == REPLICA_STUDENT))).first()
+
+        db.add(Student(student_id="ST-F01", name="Flushed", is_active=True))
+        await db.flush()
+        # Later reads in the same session must see the flushed row
+        assert (await db.execute(select(Student.id).filter(Student.name == "Flushed"))).first()
+        await db.commit()
+
+    assert "Flushed" in await _names_in(db_session.engine)
+    assert "Flushed" not in await _names_in(replica)
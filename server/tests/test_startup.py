@@ -0,0 +1,36 @@
+"""
+Startup budget: importing src.main in a fresh interpreter, as a cold start
+does (same measurement as `python -m scripts.profile_startup --budget-ms`).
+Set STARTUP_IMPORT_BUDGET_MS to tighten or loosen it for a slower runner.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts.profile_startup import APP_MODULE, profile_imports
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+# -X importtime itself adds overhead; src.main measures about 1.4s with it locally
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 2500))
+
+# Imported on first use, never at startup
+DEFERRED_MODULES = {"httpx", "openpyxl", "src.db.migrations", "src.db.site_content_seed"}
+
+
+@pytest.fixture(scope="module")
+def imports() -> dict:
+    cwd = os.getcwd()
+    os.chdir(SERVER_DIR)  # `python -c "import src.main"` resolves src from here
+    try:
+        return {name: cumulative_ms for name, _, cumulative_ms in profile_imports()}
+    finally:
+        os.chdir(cwd)
+
+
+def test_import_within_budget(imports):
+    assert imports[APP_MODULE] <= STARTUP_IMPORT_BUDGET_MS
+
+
+def test_deferred_modules_not_imported(imports):
+    assert DEFERRED_MODULES.isdisjoint(imports)
@@ -0,0 +1,123 @@
+"""
+SQL statements per write endpoint, counted by the per-request collector
+(RequestQueries) that feeds the request log and Server-Timing. Each write is
+a single INSERT/UPDATE ... RETURNING; numbered creates (students, teachers)
+also draw their public number, a separate counter UPDATE on SQLite (on
+Postgres nextval runs inside the INSERT).
+"""
+import pytest
+from sqlalchemy import insert, select
+
+from src import main
+from src.db.models.school_class import SchoolClass
+from src.db.request_queries import RequestQueries
+from src.db.session import engine
+
+pytestmark = pytest.mark.anyio
+
+# Public-number draw before the INSERT (SQLite counter row)
+NUMBER_DRAW = 1
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """Collectors of every request made during the test, newest last"""
+    collected: list[RequestQueries] = []
+
+    class RecordingQueries(RequestQueries):
+        def __init__(self, path: str = ""):
+            super().__init__(path)
+            collected.append(self)
+
+    monkeypatch.setattr(main, "RequestQueries", RecordingQueries)
+    return collected
+
+
+@pytest.fixture
+async def api(client, statements):
+    # Warm the principal cache so the auth lookup does not count
+    response = await client.get("/classes/")
+    assert response.status_code == 200
+    return client
+
+
+async def _count(statements, request) -> tuple:
+    response = await request
+    return response, statements[-1].count
+
+
+async def _add_class(class_name: str) -> int:
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            insert(SchoolClass).values(class_name=class_name, grade="1", section="A").returning(SchoolClass.id)
+        )
+        return result.scalar_one()
+
+
+async def test_create_class(api, statements):
+    response, count = await _count(statements, api.post("/classes/", json={"class_name": "Count 10-B"}))
+    assert response.status_code == 201
+    assert response.json()["section"] == ""
+    assert count == 1
+    async with engine.connect() as conn:
+        grade = await conn.scalar(select(SchoolClass.grade).filter(SchoolClass.id == response.json()["id"]))
+    assert grade == "10"
+
+
+async def test_update_class(api, statements):
+    class_id = await _add_class("Count 1")
+
+    response, count = await _count(statements, api.put(f"/classes/{class_id}", json={"section": "B"}))
+    assert response.status_code == 200
+    assert response.json()["section"] == "B"
+    assert count == 1
+
+
+async def test_student_writes(api, statements):
+    class_id = await _add_class("Count 2")
+
+    response, count = await _count(
+        statements, api.post("/students/", json={"name": "Counted Student", "class_id": class_id})
+    )
+    assert response.status_code == 201
+    assert response.json()["class_name"] == "Count 2"
+    assert count == 1 + NUMBER_DRAW
+    student_id = response.json()["id"]
+
+    response, count = await _count(statements, api.put(f"/students/{student_id}", json={"section": "C"}))
+    assert response.status_code == 200
+    assert response.json()["class_name"] == "Count 2"
+    assert count == 1
+
+
+async def test_teacher_writes(api, statements):
+    response, count = await _count(statements, api.post("/teachers/", json={"name": "Counted Teacher"}))
+    assert response.status_code == 201
+    assert count == 1 + NUMBER_DRAW
+    teacher_id = response.json()["id"]
+
+    response, count = await _count(statements, api.put(f"/teachers/{teacher_id}", json={"subject": "Math"}))
+    assert response.status_code == 200
+    assert response.json()["subject"] == "Math"
+    assert count == 1
+
+
+async def test_section_writes(api, statements):
+    response, count = await _count(statements, api.post("/site-content/sections", json={
+        "page_slug": "count", "section_key": "hero", "content": {"title": "A"},
+    }))
+    assert response.status_code == 201
+    assert response.json()["created_at"] is not None
+    assert count == 1
+    section_id = response.json()["id"]
+
+    response, count = await _count(
+        statements, api.put(f"/site-content/sections/{section_id}", json={"content": {"title": "B"}})
+    )
+    assert response.status_code == 200
+    assert response.json()["content"] == {"title": "B"}
+    assert count == 1
+
+    response, count = await _count(statements, api.put("/site-content/sections/999999", json={"order_index": 2}))
+    assert response.status_code == 404
+    assert count == 1
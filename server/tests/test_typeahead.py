@@ -0,0 +1,46 @@
+"""
+In-memory typeahead index: field-separate matching and writes made while a
+reload is running.
+"""
+from src.core.typeahead import TypeaheadIndex
+
+ROWS = [
+    ("student", 1, "Asha Smith", "ST-001"),
+    ("student", 2, "Ravi Kumar", "ST-002"),
+    ("class", 1, "Class 10-A", None),
+]
+
+
+def _labels(index, query):
+    return [entry.label for entry in index.suggest(query)]
+
+
+def test_matches_name_or_code():
+    index = TypeaheadIndex.build(ROWS)
+    assert _labels(index, "smith") == ["Asha Smith"]
+    assert _labels(index, "st-002") == ["Ravi Kumar"]
+    assert _labels(index, "st") == ["Asha Smith", "Ravi Kumar"]
+
+
+def test_match_cannot_span_name_and_code():
+    index = TypeaheadIndex.build(ROWS)
+    assert _labels(index, "smith st") == []
+    assert _labels(index, "h st-0") == []
+
+
+def test_writes_during_refresh_are_replayed():
+    index = TypeaheadIndex.build(ROWS)
+    index.begin_refresh()
+    # Local writes after the reload read its (now stale) snapshot
+    index.upsert("student", 3, "Meera Das", "ST-003")
+    index.upsert("student", 2, "Ravi Kumar Rao", "ST-002")
+    index.remove("class", 1)
+
+    index.replace(TypeaheadIndex.build(ROWS))
+    assert _labels(index, "meera") == ["Meera Das"]
+    assert _labels(index, "ravi") == ["Ravi Kumar Rao"]
+    assert _labels(index, "class") == []
+
+    # Journal is closed once the new index is in place
+    index.replace(TypeaheadIndex.build(ROWS))
+    assert _labels(index, "meera") == []
@@ -25,6 +25,7 @@ const AdminLogin = () => {
             const response = await fetch(`${apiUrl}/api/v1/login/access-token`, {
                 method: 'POST',
                 body: formDataPayload,
+                credentials: 'include', // Stores the HttpOnly refresh token cookie
             });
 
             if (!response.ok) {
@@ -10,7 +10,7 @@ import {
     AlertCircle,
 } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
-import adminFetch, { clearAdminSession } from './utils/adminApi';
+import adminFetch, { clearAdminSession, setAdminSession } from './utils/adminApi';
 
 const Settings = () => {
     const [activeTab, setActiveTab] = useState('Profile');
@@ -125,6 +125,8 @@ const Settings = () => {
             });
 
             if (response.ok) {
+                // Other sessions are signed out; this one continues with the new tokens
+                setAdminSession(await response.json());
                 setPasswordSuccess(true);
                 setPasswordData({ currentPassword: '', newPassword: '', confirmPassword: '' });
                 setTimeout(() => setPasswordSuccess(false), 3000);
@@ -5,15 +5,20 @@
 const API_URL = import.meta.env.VITE_SERVER_URL || 'http://localhost:8000';
 const API_BASE = `${API_URL}/api/v1`;
 
-// Get admin token from cookie
-export const getAdminToken = () => {
-    const match = document.cookie.match(/adminToken=([^;]+)/);
-    return match ? match[1] : null;
+const getCookie = (name) => {
+    const match = document.cookie.match(new RegExp(`${name}=([^;]+)`));
+    return match ? decodeURIComponent(match[1]) : null;
 };
 
+// Get admin token from cookie
+export const getAdminToken = () => getCookie('adminToken');
+
 // Set admin session in cookies
+// Access tokens expire after 15 minutes and are renewed through /refresh.
+// The refresh token itself is an HttpOnly cookie set by the server - scripts
+// never see it - so these cookies live as long as it does.
 export const setAdminSession = (data) => {
-    const maxAge = 4 * 60 * 60; // 4 hours
+    const maxAge = 14 * 24 * 60 * 60; // REFRESH_TOKEN_EXPIRE_DAYS
     if (data.access_token) {
         document.cookie = `adminToken=${data.access_token}; path=/; max-age=${maxAge}; SameSite=Strict`;
     }
@@ -31,8 +36,9 @@ export const setAdminSession = (data) => {
     }
 };
 
-// Clear admin session
+// Clear admin session; the server drops the HttpOnly refresh token cookie
 export const clearAdminSession = () => {
+    fetch(`${API_BASE}/refresh`, { method: 'DELETE', credentials: 'include' }).catch(() => {});
     document.cookie = 'adminToken=; path=/; max-age=0';
     document.cookie = 'adminRole=; path=/; max-age=0';
     document.cookie = 'adminName=; path=/; max-age=0';
@@ -42,10 +48,6 @@ export const clearAdminSession = () => {
 
 // Get admin info from cookies
 export const getAdminInfo = () => {
-    const getCookie = (name) => {
-        const match = document.cookie.match(new RegExp(`${name}=([^;]+)`));
-        return match ? decodeURIComponent(match[1]) : null;
-    };
     return {
         token: getAdminToken(),
         role: getCookie('adminRole'),
@@ -55,25 +57,60 @@ export const getAdminInfo = () => {
     };
 };
 
-// Authenticated fetch wrapper
-export const adminFetch = async (endpoint, options = {}) => {
-    const token = getAdminToken();
-
-    if (!token) {
-        window.location.href = '/admin/login';
-        throw new Error('No authentication token');
+// Exchange the refresh token cookie for a new token pair. Concurrent 401s
+// share one call: the server treats a second use of a refresh token as theft.
+let pendingRefresh = null;
+
+const refreshSession = () => {
+    if (!pendingRefresh) {
+        pendingRefresh = (async () => {
+            const response = await fetch(`${API_BASE}/refresh`, {
+                method: 'POST',
+                credentials: 'include'
+            });
+            if (!response.ok) {
+                return false;
+            }
+            setAdminSession(await response.json());
+            return true;
+        })()
+            .catch(() => false)
+            .finally(() => {
+                pendingRefresh = null;
+            });
     }
+    return pendingRefresh;
+};
 
+const authorizedFetch = (endpoint, options, token) => {
     const headers = {
         'Content-Type': 'application/json',
         'Authorization': `Bearer ${token}`,
         ...options.headers
     };
 
-    const response = await fetch(`${API_BASE}${endpoint}`, {
+    return fetch(`${API_BASE}${endpoint}`, {
         ...options,
-        headers
+        headers,
+        credentials: 'include' // Lets responses such as a password change set the refresh cookie
     });
+};
+
+// Authenticated fetch wrapper
+export const adminFetch = async (endpoint, options = {}) => {
+    const token = getAdminToken();
+
+    if (!token) {
+        window.location.href = '/admin/login';
+        throw new Error('No authentication token');
+    }
+
+    let response = await authorizedFetch(endpoint, options, token);
+
+    // Expired access token: renew once and retry
+    if (response.status === 401 && await refreshSession()) {
+        response = await authorizedFetch(endpoint, options, getAdminToken());
+    }
 
     if (response.status === 401) {
         clearAdminSession();